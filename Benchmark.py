@@ -0,0 +1,279 @@
+import argparse
+import contextlib
+import io
+import json
+import math
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+# Fixed seed so that every run benchmarks exactly the same data
+BENCHMARK_SEED = 12345
+
+# Probabilities used for every scenario, every optional field is populated in half of the rows
+BENCHMARK_PROBABILITIES = {
+    field: 0.5 for field in ("date_of_birth", "email", "phone", "street_address_1", "street_address_2", "city",
+                             "state_province", "postal_code", "country")
+}
+
+
+def percentile(values, fraction):
+    """
+    Return the nearest-rank percentile of a list of numbers.
+
+    Args:
+        values (list): The measured values.
+        fraction (float): The percentile as a fraction, e.g. 0.99.
+
+    Returns:
+        float: The percentile, or None if there are no values.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+
+def peak_rss_mb():
+    """
+    Return the peak resident set size of the current process in MiB.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def create_writer(target, rows, contact_generator, options, output_dir, db_config):
+    """
+    Create the writer of a benchmark target, importing its module only when it is needed.
+
+    Returns:
+        BaseWriter: The writer.
+    """
+    if target == "csv":
+        from writers.CSVWriter import CSVWriter
+        return CSVWriter(rows, contact_generator, dict(options, csv={"output_dir": output_dir}))
+    if target == "parquet":
+        from writers.ParquetWriter import ParquetWriter
+        return ParquetWriter(rows, contact_generator, dict(options, columnar={"output_dir": output_dir}))
+    if target == "arrow":
+        from writers.ArrowWriter import ArrowWriter
+        return ArrowWriter(rows, contact_generator, dict(options, columnar={"output_dir": output_dir}))
+    if target == "postgresql":
+        from writers.PostgreSQLWriter import PostgreSQLWriter
+        return PostgreSQLWriter(rows, db_config, contact_generator, options)
+    if target == "mysql":
+        from writers.MySQLWriter import MySQLWriter
+        return MySQLWriter(rows, db_config, contact_generator, options)
+    raise ValueError(f"Unknown benchmark target '{target}'.")
+
+
+def drop_table(target, writer):
+    """
+    Drop the table loaded by a database benchmark target, so that benchmark runs don't leave tables behind.
+
+    Returns:
+        None
+    """
+    if target == "postgresql":
+        import psycopg2
+        connection = psycopg2.connect(**writer.connection_config())
+    else:
+        import mysql.connector
+        connection = mysql.connector.connect(**writer.connection_config())
+    try:
+        cursor = connection.cursor()
+        cursor.execute(f"DROP TABLE IF EXISTS {writer.table_name}")
+        connection.commit()
+        cursor.close()
+    finally:
+        connection.close()
+
+
+def run_scenario(scenario):
+    """
+    Run one benchmark scenario in the current process and measure it.
+
+    The scenario runs in its own worker process, so the peak RSS belongs to the scenario alone.
+
+    Args:
+        scenario (dict): The target, engine, rows, batch_size, output_dir and db_config of the scenario.
+
+    Returns:
+        dict: The scenario with its measurements, or with a 'skipped' reason if its dependencies are missing.
+    """
+    from utils.ContactGenerator import ContactGenerator
+
+    result = {key: scenario[key] for key in ("target", "engine", "rows", "batch_size")}
+    latencies = []
+    writer = None
+
+    try:
+        setup_start = time.perf_counter()
+        contact_generator = ContactGenerator(ContactGenerator.create_faker(), BENCHMARK_PROBABILITIES,
+                                             engine=scenario["engine"], seed=BENCHMARK_SEED)
+        result["setup_seconds"] = round(time.perf_counter() - setup_start, 4)
+
+        start_time = time.perf_counter()
+        if scenario["target"] == "generate":
+            # Generation alone, latency of every generated batch
+            remaining = scenario["rows"]
+            while remaining > 0:
+                size = min(scenario["batch_size"], remaining)
+                batch_start = time.perf_counter()
+                contact_generator.generate_batch(size)
+                latencies.append(time.perf_counter() - batch_start)
+                remaining -= size
+        else:
+            writer = create_writer(scenario["target"], scenario["rows"], contact_generator,
+                                   {"batch_size": scenario["batch_size"]}, scenario["output_dir"],
+                                   scenario["db_config"])
+            write_batch = writer.write_batch
+
+            # Latency of the sink stage for every batch, generation runs ahead in the pipeline
+            def timed_write_batch(batch):
+                batch_start = time.perf_counter()
+                write_batch(batch)
+                latencies.append(time.perf_counter() - batch_start)
+
+            writer.write_batch = timed_write_batch
+            with contextlib.redirect_stdout(io.StringIO()):
+                writer.write()
+        elapsed = time.perf_counter() - start_time
+    except ImportError as e:
+        result["skipped"] = f"missing dependency: {e.name}"
+        return result
+    finally:
+        # Measured before, dropping the loaded table is not part of the benchmark
+        if scenario["target"] in ("postgresql", "mysql") and getattr(writer, "table_name", None):
+            drop_table(scenario["target"], writer)
+
+    result.update({
+        "seconds": round(elapsed, 4),
+        "rows_per_sec": round(scenario["rows"] / elapsed, 1) if elapsed else None,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "batch_latency_ms": {
+            "p50": round(percentile(latencies, 0.50) * 1000, 3),
+            "p99": round(percentile(latencies, 0.99) * 1000, 3),
+        },
+    })
+    return result
+
+
+def compare_with_baseline(results, baseline_path):
+    """
+    Add the throughput of a previous benchmark run and the relative change to every matching result.
+
+    Args:
+        results (list): The results of the current run.
+        baseline_path (str): The path to the JSON report of a previous run.
+    """
+    with open(baseline_path) as baseline_file:
+        baseline = json.load(baseline_file)
+
+    def key(result):
+        return result["target"], result["engine"], result["rows"], result["batch_size"]
+
+    previous = {key(result): result for result in baseline["results"] if "rows_per_sec" in result}
+    for result in results:
+        match = previous.get(key(result))
+        if match and result.get("rows_per_sec"):
+            result["baseline_rows_per_sec"] = match["rows_per_sec"]
+            result["change_pct"] = round((result["rows_per_sec"] / match["rows_per_sec"] - 1) * 100, 1)
+
+
+def parse_arguments(arguments):
+    """
+    Parse the command line arguments of the benchmark.
+    """
+    parser = argparse.ArgumentParser(description="Measure the throughput of contact data generation and writers.")
+    parser.add_argument("--targets", default="generate,csv,parquet,arrow",
+                        help="Comma separated targets: generate, csv, parquet, arrow, postgresql, mysql")
+    parser.add_argument("--engines", default="pool,faker", help="Comma separated ContactGenerator engines")
+    parser.add_argument("--rows", default="10000,100000", help="Comma separated row counts")
+    parser.add_argument("--batch-sizes", default="1000,10000", help="Comma separated batch sizes")
+    parser.add_argument("--db-config", help="Config file with the [database] section for database targets")
+    parser.add_argument("--output-dir", help="Directory for file targets, defaults to a directory on tmpfs")
+    parser.add_argument("--baseline", help="JSON report of a previous run to compare the throughput with")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    return parser.parse_args(arguments)
+
+
+def main(arguments=None):
+    args = parse_arguments(sys.argv[1:] if arguments is None else arguments)
+    targets = args.targets.split(",")
+
+    # Database targets need connection parameters, they are skipped without them
+    db_configs = {}
+    if args.db_config:
+        from utils.ConfigLoader import ConfigError, ConfigLoader
+        try:
+            db_type, _, db_config, _ = ConfigLoader(args.db_config).load_config()
+        except ConfigError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        db_configs[db_type] = db_config
+
+    # Write files to tmpfs when available so that the disk is not measured, and remove them after the run
+    tmpfs = "/dev/shm" if os.path.isdir("/dev/shm") else None
+    temporary_dir = None if args.output_dir else tempfile.TemporaryDirectory(prefix="contact_benchmark_", dir=tmpfs)
+    output_dir = args.output_dir or temporary_dir.name
+
+    scenarios = []
+    for target in targets:
+        for engine in args.engines.split(","):
+            for rows in map(int, args.rows.split(",")):
+                for batch_size in map(int, args.batch_sizes.split(",")):
+                    scenarios.append({"target": target, "engine": engine, "rows": rows, "batch_size": batch_size,
+                                      "output_dir": output_dir, "db_config": db_configs.get(target)})
+
+    results = []
+    try:
+        for scenario in scenarios:
+            if scenario["target"] in ("postgresql", "mysql") and scenario["db_config"] is None:
+                results.append({key: scenario[key] for key in ("target", "engine", "rows", "batch_size")}
+                               | {"skipped": "no --db-config for this database"})
+                continue
+
+            # One fresh process per scenario, so peak RSS and warm caches don't leak between scenarios
+            with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as executor:
+                results.append(executor.submit(run_scenario, scenario).result())
+            print(f"Benchmarked {scenario['target']} engine={scenario['engine']} rows={scenario['rows']} "
+                  f"batch_size={scenario['batch_size']}", file=sys.stderr)
+    finally:
+        if temporary_dir is not None:
+            temporary_dir.cleanup()
+
+    if args.baseline:
+        compare_with_baseline(results, args.baseline)
+
+    import faker
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "faker": faker.VERSION,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed": BENCHMARK_SEED,
+        },
+        "results": results,
+    }
+
+    report_json = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            output_file.write(report_json + "\n")
+    else:
+        print(report_json)
+
+
+# Calling the main function
+if __name__ == "__main__":
+    main()
@@ -1,54 +1,30 @@
-import sys
+import time
+
+# Taken before the other imports, so that the reported startup time includes them
+START_TIME = time.perf_counter()
 
-from faker import Faker
+import sys
 
 from utils.CommandValidator import CommandValidator
-from utils.ConfigLoader import ConfigLoader
-from utils.ContactGenerator import ContactGenerator
-from writers.CSVWriter import CSVWriter
-from writers.MySQLWriter import MySQLWriter
-from writers.PostgreSQLWriter import PostgreSQLWriter
-
-
-def writer_factory(db_type, number_of_contacts, db_config, contact_generator):
-    """
-    Factory function to instantiate the correct writer class based on the 'db_type' parameter.
-
-    Args:
-        db_type (str): The type of the database. Either 'csv', 'mysql', or 'postgresql'.
-        number_of_contacts (int): The number of contacts for which data should be generated.
-        db_config (dict): A dictionary containing database connection parameters.
-        contact_generator (ContactDataGenerator): An instance of ContactDataGenerator to generate fake data.
-
-    Returns:
-        An instance of the appropriate writer class.
-    """
-    if db_type == 'csv':
-        return CSVWriter(number_of_contacts, contact_generator)
-    elif db_type == 'postgresql':
-        return PostgreSQLWriter(number_of_contacts, db_config, contact_generator)
-    elif db_type == 'mysql':
-        return MySQLWriter(number_of_contacts, db_config, contact_generator)
-    else:
-        raise ValueError("Invalid 'db_type' value. Must be 'csv', 'mysql', or 'postgresql'.")
+from utils.ConfigLoader import ConfigError
+from utils.JobRunner import JobRunner
+from writers.BaseWriter import DatabaseConnectionError
 
 
 def main():
     # Validate command line arguments and store path to configuration file
     command_validator = CommandValidator(sys.argv)
-    config_file_path = command_validator.validate_cli_arguments()
-
-    # Load and validate configuration file
-    config_loader = ConfigLoader(config_file_path)
-    db_type, number_of_contacts, db_config, probabilities = config_loader.load_config()
-
-    # Instantiate ContactGenerator
-    faker = Faker()
-    contact_generator = ContactGenerator(faker, probabilities)
-
-    # Instantiate writer object and write the data
-    writer = writer_factory(db_type, number_of_contacts, db_config, contact_generator)
-    writer.write()
+    config_file_path, resume = command_validator.validate_cli_arguments()
+
+    # Load and validate all jobs of the configuration file, then run them one after the other in this process
+    job_runner = JobRunner(START_TIME)
+    try:
+        job_runner.run_file(config_file_path, resume)
+    except (ConfigError, DatabaseConnectionError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    finally:
+        job_runner.close()
 
 
 # Calling the main function
@@ -0,0 +1,65 @@
+import os
+import random
+import tempfile
+import unittest
+from collections import Counter
+
+from utils.AliasTable import AliasTable
+
+
+class TestAliasTable(unittest.TestCase):
+    """
+    Alias tables draw every value with the probability of its weight.
+    """
+
+    def assert_frequencies(self, table, expected, draws=200000, tolerance=0.01):
+        counts = Counter(table.sample(draws, random.Random(7)))
+        for value, probability in expected.items():
+            with self.subTest(value=value):
+                self.assertAlmostEqual(counts[value] / draws, probability, delta=tolerance)
+
+    def test_frequencies_follow_weights(self):
+        table = AliasTable(["a", "b", "c", "d"], [5, 3, 1.5, 0.5])
+        self.assert_frequencies(table, {"a": 0.5, "b": 0.3, "c": 0.15, "d": 0.05})
+
+    def test_zero_weight_is_never_drawn(self):
+        table = AliasTable(["a", "b", "c"], [1, 0, 3])
+        self.assertNotIn("b", table.sample(50000, random.Random(1)))
+
+    def test_single_value(self):
+        self.assertEqual(AliasTable([("x", 1)], [2]).sample(3, random.Random(1)), [("x", 1)] * 3)
+
+    def test_zipf(self):
+        table = AliasTable.zipf(["a", "b", "c"], exponent=1.0)
+        total = 1 + 1 / 2 + 1 / 3
+        self.assert_frequencies(table, {"a": 1 / total, "b": 0.5 / total, "c": 1 / 3 / total})
+
+    def test_same_random_state_same_values(self):
+        table = AliasTable(list(range(100)), [index + 1 for index in range(100)])
+        self.assertEqual(table.sample(1000, random.Random(3)), table.sample(1000, random.Random(3)))
+
+    def test_invalid_weights(self):
+        for values, weights in (([], []), (["a"], [0]), (["a", "b"], [1]), (["a", "b"], [1, -1]),
+                                (["a"], [float("inf")])):
+            with self.subTest(weights=weights):
+                with self.assertRaises(ValueError):
+                    AliasTable(values, weights)
+
+    def test_cached_table_is_built_once(self):
+        builds = []
+
+        def build():
+            builds.append(1)
+            return AliasTable(["a", "b"], [1, 3])
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            first = AliasTable.cached(cache_dir, "key", build)
+            second = AliasTable.cached(cache_dir, "key", build)
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+        self.assertEqual(len(builds), 1)
+        self.assertEqual(first.sample(100, random.Random(5)), second.sample(100, random.Random(5)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import os
+import tempfile
+import unittest
+
+from utils.Checkpoint import Checkpoint
+from utils.ConfigLoader import ConfigError, ConfigLoader
+
+
+def make_sections(**main):
+    """
+    Return the sections of a minimal valid CSV configuration, with options of 'main' replaced.
+    """
+    return {"main": dict({"db_type": "csv", "number_of_contacts": "10"}, **main), "probabilities": {"email": "0.5"}}
+
+
+class TestConfigLoader(unittest.TestCase):
+    """
+    Valid configurations load into jobs, invalid ones raise ConfigError.
+    """
+
+    def assert_config_error(self, sections, message):
+        with self.assertRaises(ConfigError) as context:
+            ConfigLoader(sections=sections).load_jobs()
+        self.assertIn(message, str(context.exception))
+
+    def test_load_config_keeps_its_shape(self):
+        db_type, number_of_contacts, db_config, probabilities = ConfigLoader(sections=make_sections()).load_config()
+        self.assertEqual((db_type, number_of_contacts, db_config, probabilities), ("csv", 10, None, {"email": 0.5}))
+
+    def test_single_job(self):
+        jobs = ConfigLoader(sections=make_sections(seed="7", workers="2")).load_jobs()
+        self.assertEqual([job["name"] for job in jobs], ["contact_data"])
+        self.assertEqual((jobs[0]["options"]["seed"], jobs[0]["options"]["workers"]), (7, 2))
+
+    def test_job_sections_override_shared_sections(self):
+        sections = dict(make_sections(), **{"job:small": {"number_of_contacts": "5"}, "job:large": {},
+                                           "job:large:probabilities": {"email": "1"}})
+        small, large = ConfigLoader(sections=sections).load_jobs()
+        self.assertEqual((small["name"], small["number_of_contacts"], small["probabilities"]),
+                         ("small", 5, {"email": 0.5}))
+        self.assertEqual((large["name"], large["number_of_contacts"], large["probabilities"]),
+                         ("large", 10, {"email": 1.0}))
+
+    def test_missing_file(self):
+        with self.assertRaises(ConfigError):
+            ConfigLoader(os.path.join(tempfile.gettempdir(), "missing_config.ini")).load_config()
+
+    def test_missing_option(self):
+        sections = make_sections()
+        del sections["main"]["number_of_contacts"]
+        self.assert_config_error(sections, "number_of_contacts")
+
+    def test_invalid_db_type(self):
+        self.assert_config_error(make_sections(db_type="oracle"), "db_type")
+
+    def test_invalid_integers(self):
+        for key, value in (("number_of_contacts", "0"), ("number_of_contacts", "²"), ("batch_size", "ten"),
+                           ("pool_size", "²"), ("workers", "-1"), ("seed", "-1"), ("seed", "²")):
+            with self.subTest(key=key, value=value):
+                self.assert_config_error(make_sections(**{key: value}), key)
+
+    def test_invalid_probability(self):
+        sections = make_sections()
+        sections["probabilities"]["email"] = "1.5"
+        self.assert_config_error(sections, "email")
+
+    def test_database_section_required(self):
+        for db_type in ("postgresql", "mysql"):
+            with self.subTest(db_type=db_type):
+                self.assert_config_error(make_sections(db_type=db_type), "'database' section")
+
+    def test_missing_database_keys(self):
+        sections = dict(make_sections(db_type="postgresql"), database={"host": "localhost"})
+        self.assert_config_error(sections, "Missing required keys")
+
+    def test_invalid_job_name(self):
+        self.assert_config_error(dict(make_sections(), **{"job:1st": {}}), "Invalid job name")
+
+    def test_invalid_job_names_the_job(self):
+        self.assert_config_error(dict(make_sections(), **{"job:bad": {"batch_size": "0"}}), "Job bad")
+
+    def test_shared_checkpoint_file(self):
+        sections = dict(make_sections(checkpoint_file="state.json"), **{"job:first": {}, "job:second": {}})
+        self.assert_config_error(sections, "checkpoint_file")
+
+
+class TestCheckpoint(unittest.TestCase):
+    """
+    Checkpoints record the progress of a load and refuse to resume it with other settings.
+    """
+
+    SETTINGS = {"seed": 42, "batch_size": 100, "locales": ("de_DE",), "probabilities": {"email": 0.5}}
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = Checkpoint(os.path.join(directory, "state.json"))
+            checkpoint.save("contacts", 300, self.SETTINGS)
+            state = checkpoint.load()
+            self.assertEqual((state["table_name"], state["rows_done"]), ("contacts", 300))
+            Checkpoint.check_settings(state, self.SETTINGS)
+
+            checkpoint.clear()
+            with self.assertRaises(ConfigError):
+                checkpoint.load()
+
+    def test_changed_settings(self):
+        state = {"table_name": "contacts", "rows_done": 300, "settings": dict(self.SETTINGS, locales=["de_DE"])}
+        with self.assertRaises(ConfigError) as context:
+            Checkpoint.check_settings(state, dict(self.SETTINGS, batch_size=200))
+        self.assertIn("batch_size", str(context.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+
+from utils.ContactGenerator import ContactGenerator
+from utils.ShardedGenerator import ShardedGenerator
+
+
+def collect_rows(batches):
+    """
+    Return the rows of a sequence of batches as a list of tuples.
+    """
+    return [row for batch in batches for row in batch.rows()]
+
+
+class TestSeedReproducibility(unittest.TestCase):
+    """
+    Seeded runs produce the same rows for any number of workers and when resumed at any row.
+    """
+
+    # Small shards and batches, so that a few hundred rows span several shards and partial batches
+    SETTINGS = {"probabilities": {"email": 0.5, "phone": 0.7, "street_address_2": 0.3}, "seed": 42, "shard_size": 40}
+    ROWS, BATCH_SIZE = 150, 16
+
+    def generate(self, settings=None, start_row=0):
+        generator = ContactGenerator.from_settings(dict(self.SETTINGS, **(settings or {})))
+        return collect_rows(generator.iter_batches(self.ROWS, self.BATCH_SIZE, start_row))
+
+    def test_same_seed_same_rows(self):
+        self.assertEqual(self.generate(), self.generate())
+
+    def test_other_seed_other_rows(self):
+        self.assertNotEqual(self.generate(), self.generate({"seed": 43}))
+
+    def test_pool_engine_is_reproducible(self):
+        settings = {"engine": "pool", "pool_size": 200}
+        self.assertEqual(self.generate(settings), self.generate(settings))
+
+    def test_worker_count_does_not_change_rows(self):
+        sharded = ShardedGenerator(self.SETTINGS, workers=2)
+        self.assertEqual(collect_rows(sharded.iter_batches(self.ROWS, self.BATCH_SIZE)), self.generate())
+
+    def test_resume_continues_at_start_row(self):
+        rows = self.generate()
+        for start_row in (0, 1, 39, 40, 57, 149):
+            with self.subTest(start_row=start_row):
+                self.assertEqual(self.generate(start_row=start_row), rows[start_row:])
+
+    def test_sharded_resume_continues_at_start_row(self):
+        sharded = ShardedGenerator(self.SETTINGS, workers=2)
+        self.assertEqual(collect_rows(sharded.iter_batches(self.ROWS, self.BATCH_SIZE, start_row=57)),
+                         self.generate()[57:])
+
+    def test_unseeded_shards_differ(self):
+        generator = ContactGenerator.from_settings(dict(self.SETTINGS, seed=None))
+        first, second = (collect_rows(generator.generate_shard(index, 40, self.BATCH_SIZE)) for index in (0, 1))
+        self.assertNotEqual(first, second)
+
+
+class TestUniqueFields(unittest.TestCase):
+    """
+    Unique fields never repeat, even when the underlying values collide.
+    """
+
+    def generate_column(self, field, settings, rows=2000):
+        # A tiny value pool makes the generated values collide constantly
+        generator = ContactGenerator.from_settings(dict({"probabilities": {}, "engine": "pool", "pool_size": 5,
+                                                         "unique": (field,), "shard_size": 300}, **settings))
+        batches = generator.iter_batches(rows, 128)
+        return [value for batch in batches for value in batch.columns[field]]
+
+    def test_unique_email(self):
+        emails = self.generate_column("email", {"seed": 1})
+        self.assertEqual(len(set(emails)), len(emails))
+        self.assertTrue(all("@" in email for email in emails))
+
+    def test_unique_phone(self):
+        phones = self.generate_column("phone", {"seed": 1})
+        self.assertEqual(len(set(phones)), len(phones))
+        self.assertTrue(all(len(phone) == 10 and phone.isdigit() for phone in phones))
+
+    def test_unique_with_empty_values(self):
+        emails = [email for email in self.generate_column("email", {"probabilities": {"email": 0.5}}) if email]
+        self.assertEqual(len(set(emails)), len(emails))
+
+    def test_unique_across_workers(self):
+        settings = {"probabilities": {}, "engine": "pool", "pool_size": 5, "unique": ("email", "phone"),
+                    "shard_size": 100}
+        batches = ShardedGenerator(settings, workers=2).iter_batches(500, 64)
+        rows = collect_rows(batches)
+        fields = ContactGenerator.FIELDS
+        for field in ("email", "phone"):
+            values = [row[fields.index(field)] for row in rows]
+            self.assertEqual(len(set(values)), len(values), field)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import hashlib
+import math
+import os
+import pickle
+from array import array
+
+
+class AliasTable:
+    """
+    Class for drawing values from a weighted discrete distribution in constant time.
+
+    The table is built once with Vose's alias method: every slot holds the probability of keeping its own value
+    and the index of an alias taking the rest of the slot. A draw then costs one random number, whatever the
+    number of values or the skew of their weights. Built tables can be cached on disk with cached, so expensive
+    tables are built only once across runs.
+    """
+
+    def __init__(self, values, weights):
+        """
+        Initialize AliasTable with the values and their relative weights.
+
+        Args:
+            values (list): The values drawn by sample, e.g. strings or tuples of correlated values.
+            weights (list): The non-negative weight of every value, not necessarily summing up to 1.
+        """
+        size = len(values)
+        total = sum(weights)
+        if size == 0 or size != len(weights) or not 0 < total < math.inf or min(weights) < 0:
+            raise ValueError("An alias table needs at least one value and one non-negative weight per value, "
+                             "with a positive and finite sum.")
+
+        # Scale the weights so that their mean is 1, then pair every slot below 1 with one above 1
+        scaled = [weight * size / total for weight in weights]
+        probabilities = array("d", [1.0]) * size
+        aliases = array("L", range(size))
+        small = [index for index, weight in enumerate(scaled) if weight < 1]
+        large = [index for index, weight in enumerate(scaled) if weight >= 1]
+        while small and large:
+            index, alias = small.pop(), large.pop()
+            probabilities[index] = scaled[index]
+            aliases[index] = alias
+            scaled[alias] += scaled[index] - 1
+            (small if scaled[alias] < 1 else large).append(alias)
+
+        self.values = list(values)
+        self._probabilities = probabilities
+        self._aliases = aliases
+
+    @classmethod
+    def zipf(cls, values, exponent=1.0):
+        """
+        Build a table giving the values a Zipf distribution by rank, like city populations or name frequencies.
+
+        Args:
+            values (list): The values, most frequent first.
+            exponent (float): The exponent of the distribution, larger values make it more skewed.
+
+        Returns:
+            AliasTable: The table with weight 1 / rank ** exponent for every value.
+        """
+        return cls(values, [1 / rank ** exponent for rank in range(1, len(values) + 1)])
+
+    @classmethod
+    def cached(cls, cache_dir, key, build):
+        """
+        Return the table stored under a key in the cache directory, building and storing it if it is missing.
+
+        Args:
+            cache_dir (str): The cache directory, or None to always build the table.
+            key (str): A description of everything the table is built from, e.g. source, locale and seed.
+            build (callable): A function without arguments returning the table.
+
+        Returns:
+            AliasTable: The cached or newly built table.
+        """
+        if cache_dir is None:
+            return build()
+
+        path = os.path.join(cache_dir, f"{hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]}.pickle")
+        try:
+            with open(path, "rb") as cache_file:
+                return pickle.load(cache_file)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, ValueError):
+            # Missing, partial or stale tables, e.g. pickled by an older version of the code, are built anew
+            pass
+
+        # Write to a temporary file first, so that concurrent processes never read a partial table
+        table = build()
+        os.makedirs(cache_dir, exist_ok=True)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "wb") as cache_file:
+            pickle.dump(table, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, path)
+        return table
+
+    def __len__(self):
+        return len(self.values)
+
+    def sample(self, k, random_generator):
+        """
+        Draw k values from the table with replacement.
+
+        Args:
+            k (int): The number of values to draw.
+            random_generator (random.Random): The source of randomness.
+
+        Returns:
+            list: The drawn values.
+        """
+        values, probabilities, aliases = self.values, self._probabilities, self._aliases
+        size, draw = len(values), random_generator.random
+        drawn = []
+        for _ in range(k):
+            # The integer part of the draw selects the slot, the fraction decides between its value and its alias
+            position = draw() * size
+            index = int(position)
+            drawn.append(values[index] if position - index < probabilities[index] else values[aliases[index]])
+        return drawn
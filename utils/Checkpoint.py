@@ -0,0 +1,96 @@
+import json
+import os
+
+from utils.ConfigLoader import ConfigError
+
+
+class Checkpoint:
+    """
+    Class for recording the progress of a database load in a small local state file.
+
+    The state holds the target table, the number of rows committed so far and the settings that determine the
+    generated rows (seed, shard size, batch size, probabilities, ...). With these, an interrupted load can be
+    resumed into the same table and the remaining rows are regenerated exactly as a complete run would have
+    produced them.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize Checkpoint with the path of the state file.
+
+        Args:
+            path (str): The path of the state file.
+        """
+        self.path = path
+
+    def load(self):
+        """
+        Read the state of an interrupted load.
+
+        Returns:
+            dict: The saved state with 'table_name', 'rows_done' and 'settings'.
+
+        Raises:
+            ConfigError: If the state file doesn't exist or is not a valid checkpoint.
+        """
+        try:
+            with open(self.path, "r") as state_file:
+                state = json.load(state_file)
+        except FileNotFoundError:
+            raise ConfigError(f"No checkpoint found at {self.path}. There is no interrupted load to resume.")
+        except ValueError as e:
+            raise ConfigError(f"Invalid checkpoint file {self.path} - {e}")
+
+        if not isinstance(state, dict) or not {"table_name", "rows_done", "settings"} <= state.keys():
+            raise ConfigError(f"Invalid checkpoint file {self.path}. Missing table_name, rows_done or settings.")
+        return state
+
+    def save(self, table_name, rows_done, settings):
+        """
+        Write the state, replacing the previous one atomically so a crash never leaves a partial file.
+
+        Args:
+            table_name (str): The name of the target table.
+            rows_done (int): The number of rows committed to the table.
+            settings (dict): The settings that determine the generated rows.
+
+        Returns:
+            None
+        """
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, "w") as state_file:
+            json.dump({"table_name": table_name, "rows_done": rows_done, "settings": settings}, state_file, indent=2)
+            state_file.flush()
+            os.fsync(state_file.fileno())
+        os.replace(temporary_path, self.path)
+
+    def clear(self):
+        """
+        Remove the state file once the load has completed.
+
+        Returns:
+            None
+        """
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    @staticmethod
+    def check_settings(state, settings):
+        """
+        Check that the current configuration produces the same rows as the one of the interrupted load.
+
+        Args:
+            state (dict): The state returned by load.
+            settings (dict): The settings of the current configuration.
+
+        Raises:
+            ConfigError: If any setting differs from the saved one.
+        """
+        # JSON turns the tuples of the settings into lists, compare both in the same form
+        saved_settings = state["settings"]
+        changed = [key for key in sorted(set(settings) | set(saved_settings))
+                   if json.loads(json.dumps(settings.get(key))) != saved_settings.get(key)]
+        if changed:
+            raise ConfigError(f"Cannot resume, the configuration has changed since the load was interrupted: "
+                              f"{', '.join(changed)}. Restore the previous values or start a new load without "
+                              f"--resume.")
@@ -19,22 +19,27 @@ class CommandValidator:
         Validate command line arguments and return the configuration file path.
 
         This method checks if the correct number of arguments are provided. If any validation fails, the program
-        will exit with an error message. If validation passes, the method returns the configuration file path.
+        will exit with an error message. If validation passes, the method returns the configuration file path and
+        whether the optional --resume flag was given.
 
         Returns:
-            str: The path to the configuration file if the command line arguments are valid.
+            tuple: The path to the configuration file and True if an interrupted load should be resumed.
 
         Raises:
             SystemExit: If the command line arguments are invalid the program will exit with a non-zero status.
         """
+        # Separate the optional --resume flag from the positional arguments
+        resume = "--resume" in self.arguments[1:]
+        arguments = [argument for argument in self.arguments if argument != "--resume"]
+
         # Validate correct usage of the command
-        if len(self.arguments) != 2:
-            print("Error: Invalid command. Follow usage: python <script_file_path> <config_file_path>\n"
+        if len(arguments) != 2:
+            print("Error: Invalid command. Follow usage: python <script_file_path> <config_file_path> [--resume]\n"
                   "Example Command: python .\DataGenerator.py .\configs\config_mysql.ini")
             sys.exit(1)
 
         # Assigning file path of the config file
-        config_file_path = self.arguments[1]
+        config_file_path = arguments[1]
 
-        # Return path to configuration file
-        return config_file_path
+        # Return path to configuration file and the resume flag
+        return config_file_path, resume
@@ -1,20 +1,42 @@
 import configparser
-import sys
+import csv
+import math
+from graphlib import CycleError, TopologicalSorter
+
+from faker.config import AVAILABLE_LOCALES
+
+from utils.ContactGenerator import ContactGenerator
+from utils.TableSpec import TableSpec
+
+
+class ConfigError(ValueError):
+    """
+    Exception raised when a configuration is missing, malformed or has an invalid value.
+    """
+    pass
 
 
 class ConfigLoader:
     """
     Class for loading and validating the configuration file.
+
+    A configuration describes one job, or several jobs in '[job:<name>]' sections. Every job starts from the
+    sections of the file, its job section overrides options of 'main' and a '[job:<name>:<section>]' section
+    overrides options of that section, e.g. '[job:small:probabilities]'. Invalid configurations raise ConfigError,
+    so the loader can be embedded in other programs.
     """
 
-    def __init__(self, config_file_path):
+    def __init__(self, config_file_path=None, sections=None):
         """
-        Initialize ConfigLoader with the path to the configuration file.
+        Initialize ConfigLoader with the path to the configuration file, or with the configuration itself.
 
         Args:
             config_file_path (str): The path to the configuration file.
+            sections (dict): Instead of a file, a dictionary mapping section names to dictionaries of options,
+                             e.g. {'main': {'db_type': 'csv', 'number_of_contacts': 100}, 'probabilities': {}}.
         """
         self.config_file_path = config_file_path
+        self.sections = sections
 
     def load_config(self):
         """
@@ -23,47 +45,254 @@ class ConfigLoader:
         This method reads the given configuration file and checks if the
         file exists, is in the correct format, and contains valid values for
         number_of_contacts, probabilities, and database connection data.
+        Job sections are ignored, see load_jobs.
 
         Returns:
-            tuple: A tuple containing the number_of_contacts, db_config, and probabilities.
+            tuple: A tuple containing the db_type, number_of_contacts, db_config and probabilities. The optional
+                   generation settings are part of the jobs returned by load_jobs.
 
         Raises:
-            SystemExit: If the configuration file is not found, not in the correct format,
+            ConfigError: If the configuration file is not found, not in the correct format,
                         has invalid number_of_contacts, probabilities or missing required database keys.
         """
+        db_type, number_of_contacts, db_config, probabilities, _ = self._validate(self._read())
+        return db_type, number_of_contacts, db_config, probabilities
+
+    def load_jobs(self):
+        """
+        Load and validate all jobs of the configuration, before any of them is run.
+
+        Without job sections, the configuration is a single job named 'contact_data'. Output files and tables of
+        a job are named after it. Jobs with checkpointing need checkpoint files of their own.
+
+        Returns:
+            list: One dictionary per job in file order, with 'name', 'db_type', 'number_of_contacts', 'db_config'
+                  and 'probabilities' as returned by load_config, and 'options', a dictionary with the validated
+                  optional generation settings.
+
+        Raises:
+            ConfigError: If the configuration or any of its jobs is invalid, naming the job.
+        """
+        config = self._read()
+        names = [section[len("job:"):] for section in config.sections()
+                 if section.startswith("job:") and section.count(":") == 1]
+        if not names:
+            return [self._create_job("contact_data", self._validate(config))]
+
+        jobs = []
+        for name in names:
+            if not name.isidentifier():
+                raise ConfigError(f"Invalid job name {name}. Must be a valid identifier.")
+            try:
+                job = self._create_job(name, self._validate(self._job_config(config, name)))
+            except ConfigError as e:
+                raise ConfigError(f"Job {name}: {e}") from e
+            job["options"]["name"] = name
+            jobs.append(job)
+
+        # Jobs sharing a checkpoint file would overwrite each other's progress
+        checkpoint_files = [job["options"]["checkpoint_file"] for job in jobs if job["options"]["checkpoint_file"]]
+        if len(checkpoint_files) != len(set(checkpoint_files)):
+            raise ConfigError("Every job needs its own checkpoint_file. Set it in the job sections, not in 'main'.")
+        return jobs
+
+    def _read(self):
+        """
+        Read the configuration file, or the given sections, into a ConfigParser.
+
+        Raises:
+            ConfigError: If the file doesn't exist or is not a valid INI file.
+        """
+        # Instantiate ConfigParser
+        config = configparser.ConfigParser()
+        if self.sections is not None:
+            config.read_dict(self.sections)
+            return config
 
         # Validate if the file exists
         try:
             with open(self.config_file_path, 'r'):
                 pass
         except FileNotFoundError:
-            print(f"Error: Config file not found at {self.config_file_path}. Please check the file path.")
-            sys.exit(1)
-
-        # Instantiate ConfigParser
-        config = configparser.ConfigParser()
+            raise ConfigError(f"Config file not found at {self.config_file_path}. Please check the file path.")
 
         # Try reading the config file, validate if format is correct
         try:
             config.read(self.config_file_path)
         except configparser.Error as e:
-            print(f"Error: Invalid INI format in config file - {e}")
-            sys.exit(1)
+            raise ConfigError(f"Invalid INI format in config file - {e}")
+        return config
+
+    @staticmethod
+    def _job_config(config, name):
+        """
+        Build the configuration of one job from the shared sections and the sections of the job.
+
+        Args:
+            config (ConfigParser): The parsed configuration file.
+            name (str): The name of the job.
 
+        Returns:
+            ConfigParser: The configuration of the job, without job sections.
+        """
+        prefix = f"job:{name}:"
+        sections = {section: dict(config.items(section, raw=True))
+                    for section in config.sections() if not section.startswith("job:")}
+
+        # The job section overrides 'main', its subsections override the shared sections of the same name
+        overrides = {"main": f"job:{name}"}
+        overrides.update({section[len(prefix):]: section for section in config.sections()
+                          if section.startswith(prefix)})
+        for section, job_section in overrides.items():
+            sections.setdefault(section, {}).update(config.items(job_section, raw=True))
+
+        job_config = configparser.ConfigParser()
+        job_config.read_dict(sections)
+        return job_config
+
+    @staticmethod
+    def _create_job(name, loaded_config):
+        """
+        Return the dictionary of a job from its name and the tuple returned by _validate.
+        """
+        db_type, number_of_contacts, db_config, probabilities, options = loaded_config
+        return {"name": name, "db_type": db_type, "number_of_contacts": number_of_contacts, "db_config": db_config,
+                "probabilities": probabilities, "options": options}
+
+    def _validate(self, config):
+        """
+        Validate a parsed configuration, see load_config.
+
+        Returns:
+            tuple: The db_type, number_of_contacts, db_config, probabilities and options of the configuration.
+
+        Raises:
+            ConfigError: If a required option is missing or an option has an invalid value.
+        """
+        try:
+            return self._validate_options(config)
+        except configparser.Error as e:
+            raise ConfigError(f"Incomplete config file - {e}") from e
+
+    def _validate_options(self, config):
+        """
+        Validate the options of a parsed configuration, see load_config.
+        """
         # Validate db_type
         db_type = config.get("main", "db_type")
-        if db_type not in ("csv", "postgresql", "mysql"):
-            print(f"Error: Invalid db_type specified in the config file. Must be: csv, postgresql or mysql.")
-            sys.exit(1)
+        if db_type not in ("csv", "postgresql", "mysql", "parquet", "arrow", "stream"):
+            raise ConfigError(f"Invalid db_type specified in the config file. "
+                              f"Must be: csv, postgresql, mysql, parquet, arrow or stream.")
 
         # Validate number_of_contacts(int() - integer; number_of_contacts < 1 - positive integer)
         number_of_contacts_str = config.get("main", "number_of_contacts")
 
-        if not number_of_contacts_str.isdigit() or int(number_of_contacts_str) < 1:
-            print("Error: Invalid number_of_contacts specified in the config file. Must be a positive integer.")
-            sys.exit(1)
-        else:
+        try:
             number_of_contacts = int(number_of_contacts_str)
+        except ValueError:
+            number_of_contacts = 0
+        if number_of_contacts < 1:
+            raise ConfigError("Invalid number_of_contacts specified in the config file. Must be a positive integer.")
+
+        # Validate optional generation settings and save into dictionary
+        options = {
+            "engine": self._get_choice(config, "main", "engine", ("faker", "pool"), "faker"),
+            "pool_size": self._get_positive_int(config, "main", "pool_size", 10000),
+            "workers": self._get_positive_int(config, "main", "workers", 1),
+            "batch_size": self._get_positive_int(config, "main", "batch_size", 10000),
+            "queue_depth": self._get_positive_int(config, "main", "queue_depth", 4),
+            "pipeline_backend": self._get_choice(config, "main", "pipeline_backend", ("thread", "process"), "thread"),
+            "shard_size": self._get_positive_int(config, "main", "shard_size", 20000),
+            "seed": None,
+            "checkpoint_file": config.get("main", "checkpoint_file", fallback=None) or None,
+        }
+
+        # Validate CSV output options (optional 'csv' section)
+        options["csv"] = {
+            "output_dir": config.get("csv", "output_dir", fallback="csv_output"),
+            "part_size": self._get_positive_int(config, "csv", "part_size", None),
+            "compression": self._get_choice(config, "csv", "compression", ("none", "gzip", "zstd"), "none"),
+            "compression_level": self._get_positive_int(config, "csv", "compression_level", None),
+            "buffer_size": self._get_positive_int(config, "csv", "buffer_size", 1024 * 1024),
+        }
+
+        # The highest compression level depends on the compressor
+        max_level = {"gzip": 9, "zstd": 22}.get(options["csv"]["compression"])
+        if max_level and (options["csv"]["compression_level"] or 1) > max_level:
+            raise ConfigError(f"Invalid compression_level specified in the config file. Must be between 1 and "
+                              f"{max_level} for {options['csv']['compression']}.")
+
+        # Validate streaming output options (optional 'stream' section)
+        options["stream"] = {
+            "target": config.get("stream", "target", fallback="-"),
+            "format": self._get_choice(config, "stream", "format", ("csv", "tsv", "ndjson", "copy"), "csv"),
+            "delimiter": config.get("stream", "delimiter", fallback=";"),
+            "header": self._get_bool(config, "stream", "header", True),
+            "buffer_size": self._get_positive_int(config, "stream", "buffer_size", 1024 * 1024),
+        }
+        if len(options["stream"]["delimiter"]) != 1:
+            raise ConfigError("Invalid delimiter specified in the config file. Must be a single character.")
+
+        # Validate Parquet and Arrow output options (optional 'columnar' section)
+        if db_type == "arrow":
+            compressions, default_compression = ("none", "lz4", "zstd"), "none"
+        else:
+            compressions, default_compression = ("none", "snappy", "gzip", "zstd", "lz4", "brotli"), "snappy"
+        options["columnar"] = {
+            "output_dir": config.get("columnar", "output_dir", fallback="columnar_output"),
+            "compression": self._get_choice(config, "columnar", "compression", compressions, default_compression),
+        }
+
+        # Validate progress, metrics and profiling options (optional 'metrics' section)
+        options["metrics"] = {
+            "progress": self._get_bool(config, "metrics", "progress", True),
+            "progress_interval": self._get_positive_int(config, "metrics", "progress_interval", 5),
+            "metrics_file": config.get("metrics", "metrics_file", fallback=None),
+            "metrics_format": self._get_choice(config, "metrics", "metrics_format", ("json", "prometheus"), "json"),
+            "profile": self._get_bool(config, "metrics", "profile", False),
+            "profile_file": config.get("metrics", "profile_file", fallback="contact_data.prof"),
+            "tracemalloc": self._get_bool(config, "metrics", "tracemalloc", False),
+        }
+
+        # Validate table options (optional 'table' section)
+        if config.has_section("table"):
+            options["table"] = self._load_table_options(config)
+        else:
+            options["table"] = None
+
+        # Validate the fields generated unique (optional), including the single column unique keys of the table
+        options["unique"] = self._load_unique_fields(config, options["table"])
+
+        # Validate seed (optional, non-negative integer)
+        seed_str = config.get("main", "seed", fallback=None)
+        if seed_str is not None:
+            try:
+                options["seed"] = int(seed_str)
+            except ValueError as e:
+                raise ConfigError("Invalid seed specified in the config file. Must be a non-negative integer.") from e
+            if options["seed"] < 0:
+                raise ConfigError("Invalid seed specified in the config file. Must be a non-negative integer.")
+
+        # Validate the weighted locale mix (optional 'locales' section)
+        if config.has_section("locales"):
+            options["locales"] = self._load_locales(config)
+        else:
+            options["locales"] = None
+
+        # Validate weighted and correlated distributions (optional 'distributions' section)
+        if config.has_section("distributions"):
+            options["distributions"] = self._load_distributions(config)
+        else:
+            options["distributions"] = None
+
+        # Validate the relational schema (optional 'schema' section with one 'schema:<table>' section per table)
+        if config.has_section("schema"):
+            if db_type == "stream":
+                raise ConfigError("A schema of several tables can't be written to a single stream. "
+                                  "Remove the 'schema' section or choose another db_type.")
+            options["schema"] = self._load_schema(config, number_of_contacts)
+        else:
+            options["schema"] = None
 
         # Validate probabilities and save into dictionary
         probabilities = {}
@@ -73,12 +302,10 @@ class ConfigLoader:
             try:
                 value = float(value)
             except ValueError:
-                print(f"Error: Invalid input for {key}. Must be a positive integer or a float between 0 and 1.")
-                sys.exit(1)
+                raise ConfigError(f"Invalid input for {key}. Must be a positive integer or a float between 0 and 1.")
             # Validate probability range
             if not (0 <= value <= 1):
-                print(f"Error: Invalid probability value for {key}. Must be between 0 and 1.")
-                sys.exit(1)
+                raise ConfigError(f"Invalid probability value for {key}. Must be between 0 and 1.")
             else:
                 probabilities[key] = value
 
@@ -92,12 +319,437 @@ class ConfigLoader:
 
                 missing_keys = required_keys - db_config.keys()
                 if missing_keys:
-                    print(
-                        f"Error: Missing required keys in the 'database' section of the config file: "
+                    raise ConfigError(
+                        f"Missing required keys in the 'database' section of the config file: "
                         f"{', '.join(missing_keys)}")
-                    sys.exit(1)
+
+            # Validate the load method of the selected database
+            if db_type == "postgresql":
+                self._get_choice(config, "database", "load_method", ("copy", "insert"), "copy")
+            elif db_type == "mysql":
+                self._get_choice(config, "database", "load_method", ("insert", "load_data"), "insert")
+
+            # Validate asynchronous writer settings and store them as typed values
+            db_config["async_mode"] = self._get_bool(config, "database", "async_mode", False)
+            db_config["pool_size"] = self._get_positive_int(config, "database", "pool_size", 4)
+            db_config["max_inflight_chunks"] = self._get_positive_int(config, "database", "max_inflight_chunks",
+                                                                      2 * db_config["pool_size"])
+        elif db_type in ("postgresql", "mysql"):
+            raise ConfigError(f"Missing 'database' section in the config file, required for db_type {db_type}.")
         else:
             db_config = None
 
-        # Return number of contacts, database configuration, probabilities
-        return db_type, number_of_contacts, db_config, probabilities
+        # Return number of contacts, database configuration, probabilities and generation options
+        return db_type, number_of_contacts, db_config, probabilities, options
+
+    def _load_table_options(self, config):
+        """
+        Load and validate the 'table' section describing keys, indexes and load-time table settings.
+
+        Indexes are separated by commas and the columns of a composite index by '+', for example
+        'indexes = last_name, city+state_province'.
+
+        Args:
+            config (ConfigParser): The parsed configuration file.
+
+        Returns:
+            dict: The keyword arguments of TableSpec, without 'fields'.
+
+        Raises:
+            ConfigError: If an option refers to an unknown column or has an invalid value.
+        """
+        primary_key = self._get_column_groups(config, "primary_key", allow_surrogate=True)
+        if len(primary_key) > 1:
+            raise ConfigError("Invalid primary_key specified in the config file. Only one primary key is allowed.")
+
+        return {
+            "primary_key": primary_key[0] if primary_key else None,
+            "indexes": self._get_column_groups(config, "indexes"),
+            "unique": self._get_column_groups(config, "unique"),
+            "unlogged": self._get_bool(config, "table", "unlogged", False),
+            "disable_checks": self._get_bool(config, "table", "disable_checks", False),
+        }
+
+    @staticmethod
+    def _load_unique_fields(config, table_options):
+        """
+        Load and validate the fields whose values must be unique, e.g. 'unique = email, phone' in 'main'.
+
+        Fields that are the only column of the primary key or a unique index of the 'table' section are added, so
+        that the key can be built on the loaded data.
+
+        Args:
+            config (ConfigParser): The parsed configuration file.
+            table_options (dict): The validated 'table' options, or None.
+
+        Returns:
+            tuple: The unique fields, possibly empty.
+
+        Raises:
+            ConfigError: If a field can't be generated unique.
+        """
+        unique = [field.strip() for field in config.get("main", "unique", fallback="").split(",") if field.strip()]
+        invalid_fields = [field for field in unique if field not in ContactGenerator.UNIQUE_FIELDS]
+        if invalid_fields:
+            raise ConfigError(f"Invalid unique specified in the config file: {', '.join(invalid_fields)}. "
+                              f"Must be: {', '.join(ContactGenerator.UNIQUE_FIELDS)}.")
+
+        if table_options:
+            keys = table_options["unique"] + ([table_options["primary_key"]] if table_options["primary_key"] else [])
+            unique += [columns[0] for columns in keys
+                       if len(columns) == 1 and columns[0] in ContactGenerator.UNIQUE_FIELDS]
+        return tuple(dict.fromkeys(unique))
+
+    @classmethod
+    def _load_distributions(cls, config):
+        """
+        Load and validate the 'distributions' section describing weighted and correlated value distributions.
+
+        'places' and every field of ContactGenerator.CATEGORICAL_FIELDS take 'zipf' or the path of a ';' separated
+        file with a header, 'age_pyramid' takes 'default' or groups such as '0-17:20, 18-64:60, 65-100:20',
+        'null_groups' takes fields joined by '+' separated by commas, e.g. 'street_address_1+city+postal_code'.
+
+        Args:
+            config (ConfigParser): The parsed configuration file.
+
+        Returns:
+            dict: The keyword argument 'distributions' of ContactGenerator.
+
+        Raises:
+            ConfigError: If an option is unknown or has an invalid value.
+        """
+        distributions = {"fields": {}, "cache_dir": "distribution_cache"}
+
+        for key, value in config.items("distributions"):
+            if key == "places":
+                distributions["places"] = cls._get_distribution_source(key, value, ContactGenerator.PLACE_FIELDS)
+            elif key in ContactGenerator.CATEGORICAL_FIELDS:
+                distributions["fields"][key] = cls._get_distribution_source(key, value, ("value",))
+            elif key == "age_pyramid":
+                distributions["age_pyramid"] = cls._parse_age_pyramid(value)
+            elif key == "zipf_exponent":
+                try:
+                    distributions["zipf_exponent"] = float(value)
+                except ValueError:
+                    distributions["zipf_exponent"] = 0
+                if distributions["zipf_exponent"] <= 0:
+                    raise ConfigError("Invalid zipf_exponent specified in the config file. Must be a positive number.")
+            elif key == "null_groups":
+                distributions["null_groups"] = cls._parse_null_groups(value)
+            elif key == "cache_dir":
+                distributions["cache_dir"] = value or None
+            else:
+                raise ConfigError(f"Invalid option {key} in the 'distributions' section of the config file. Must be "
+                                  f"places, age_pyramid, zipf_exponent, null_groups, cache_dir or one of the fields "
+                                  f"{', '.join(ContactGenerator.CATEGORICAL_FIELDS)}.")
+        return distributions
+
+    @staticmethod
+    def _get_distribution_source(key, value, columns):
+        """
+        Validate the source of a weighted table: 'zipf' or a readable file whose header has one of the columns and
+        whose weights are non-negative numbers with a positive sum.
+
+        Returns:
+            str: 'zipf' or the path of the file.
+        """
+        if value == "zipf":
+            return value
+        try:
+            table_file = open(value, newline="", encoding="utf-8")
+        except OSError as e:
+            raise ConfigError(f"Invalid {key} specified in the config file. Must be zipf or a readable file - {e}")
+
+        with table_file:
+            rows = csv.reader(table_file, delimiter=";")
+            header = next(rows, [])
+            if not set(header) & set(columns):
+                raise ConfigError(f"The header of {value} must name at least one of the columns: "
+                                  f"{', '.join(columns)}, and optionally weight.")
+
+            # Check the weights now, so that a broken file fails like any other invalid option
+            total = 0
+            for line, row in enumerate(csv.DictReader(table_file, fieldnames=header, delimiter=";"), 2):
+                try:
+                    weight = float(row.get("weight") or 1)
+                except ValueError:
+                    weight = -1
+                if not math.isfinite(weight) or weight < 0:
+                    raise ConfigError(f"Invalid weight in line {line} of {value}. Must be a non-negative number.")
+                total += weight
+
+        if not 0 < total < math.inf:
+            raise ConfigError(f"The distribution file {value} must have at least one row with a positive weight.")
+        return value
+
+    @staticmethod
+    def _parse_age_pyramid(value):
+        """
+        Parse an age pyramid, 'default' or comma separated 'first_age-last_age:weight' groups.
+
+        Returns:
+            tuple: (first age, last age, weight) tuples.
+        """
+        if value == "default":
+            return ContactGenerator.DEFAULT_AGE_PYRAMID
+
+        age_pyramid = []
+        for group in value.split(","):
+            try:
+                ages, weight = group.split(":")
+                first_age, last_age = (int(age) for age in ages.split("-"))
+                weight = float(weight)
+            except ValueError:
+                first_age, last_age, weight = 0, -1, 0
+            if not 0 <= first_age <= last_age <= ContactGenerator.MAX_AGE or not 0 < weight < math.inf:
+                raise ConfigError(f"Invalid age group '{group.strip()}' in age_pyramid. Must be "
+                                  f"first_age-last_age:weight with ages from 0 to {ContactGenerator.MAX_AGE} and a "
+                                  f"positive weight, e.g. 18-64:60.")
+            age_pyramid.append((first_age, last_age, weight))
+        return tuple(age_pyramid)
+
+    @staticmethod
+    def _parse_null_groups(value):
+        """
+        Parse comma separated groups of fields joined by '+' that are empty together.
+
+        Returns:
+            tuple: Field tuples, each with at least two fields.
+        """
+        known_fields = ContactGenerator.FIELDS + ContactGenerator.EXTRA_FIELDS
+        null_groups = []
+        grouped_fields = set()
+        for group in value.split(","):
+            if not group.strip():
+                continue
+            fields = tuple(field.strip() for field in group.split("+"))
+            invalid_fields = [field for field in fields if field not in known_fields or field in grouped_fields]
+            if len(fields) < 2 or len(set(fields)) < len(fields) or invalid_fields:
+                raise ConfigError(f"Invalid null group '{group.strip()}' in null_groups. Must be at least two fields "
+                                  f"joined by '+', each in one group only.")
+            grouped_fields.update(fields)
+            null_groups.append(fields)
+        return tuple(null_groups)
+
+    @staticmethod
+    def _load_locales(config):
+        """
+        Load and validate the 'locales' section mapping Faker locales to their weight in the generated data.
+
+        For example 'de_DE = 0.4', 'fr_FR = 0.3' and 'en_GB = 0.3'. The weights are relative and don't need to
+        add up to 1.
+
+        Args:
+            config (ConfigParser): The parsed configuration file.
+
+        Returns:
+            dict: The locales in the spelling Faker expects, mapped to their weights.
+
+        Raises:
+            ConfigError: If a locale is not supported by Faker or a weight is not a positive number.
+        """
+        # ConfigParser lowercases the keys, restore the spelling of the Faker locales
+        known_locales = {locale.lower(): locale for locale in AVAILABLE_LOCALES}
+
+        locales = {}
+        for key, value in config.items("locales"):
+            if key not in known_locales:
+                raise ConfigError(f"Invalid locale {key} in the 'locales' section of the config file. "
+                                  f"Must be a locale supported by Faker, e.g. en_US or de_DE.")
+            try:
+                weight = float(value)
+            except ValueError:
+                weight = 0
+            if not math.isfinite(weight) or weight <= 0:
+                raise ConfigError(f"Invalid weight for locale {key}. Must be a positive number.")
+            locales[known_locales[key]] = weight
+
+        if not locales:
+            raise ConfigError("The 'locales' section of the config file must list at least one locale.")
+        return locales
+
+    def _load_schema(self, config, number_of_contacts):
+        """
+        Load and validate the 'schema' section and the table sections of a relational schema.
+
+        'tables' lists the tables, each described by a 'schema:<table>' section. A root table has 'rows' (defaults
+        to number_of_contacts); a child table names its 'parent' and has 'fan_out' rows per parent row, linked by
+        the 'foreign_key' column (defaults to '<parent>_id'). 'fields' selects the value columns and 'distribution'
+        is 'even' or 'random'.
+
+        Args:
+            config (ConfigParser): The parsed configuration file.
+            number_of_contacts (int): The default number of rows of root tables.
+
+        Returns:
+            list: One dictionary per table with 'name', 'rows', 'parent', 'foreign_key', 'fields' and
+                  'distribution', parents before their children.
+
+        Raises:
+            ConfigError: If a table is missing or invalid, or the parents form a cycle.
+        """
+        names = [name.strip() for name in config.get("schema", "tables", fallback="").split(",") if name.strip()]
+        if not names:
+            raise ConfigError("The 'schema' section of the config file must list at least one table in 'tables'.")
+
+        value_fields = [field for field in TableSpec.COLUMN_TYPES if field != TableSpec.SURROGATE_KEY]
+        tables = {}
+        for name in names:
+            section = f"schema:{name}"
+            if not name.isidentifier():
+                raise ConfigError(f"Invalid table name {name} in the 'schema' section. Must be a valid identifier.")
+            if not config.has_section(section):
+                raise ConfigError(f"Missing section '{section}' in the config file.")
+
+            # Validate the value columns, by default the contact columns
+            fields = tuple(field.strip() for field in config.get(section, "fields", fallback="").split(",")
+                           if field.strip())
+            unknown_fields = [field for field in fields if field not in value_fields]
+            if unknown_fields:
+                raise ConfigError(f"Invalid fields in section '{section}'. Unknown columns: "
+                                  f"{', '.join(unknown_fields)}")
+
+            parent = config.get(section, "parent", fallback=None)
+            table = {
+                "name": name,
+                "parent": parent,
+                "fields": fields or None,
+                "distribution": self._get_choice(config, section, "distribution", ("even", "random"), "even"),
+            }
+
+            if parent is None:
+                table["rows"] = self._get_positive_int(config, section, "rows", number_of_contacts)
+                table["foreign_key"] = None
+            else:
+                if parent not in names:
+                    raise ConfigError(f"Invalid parent {parent} in section '{section}'. Must be one of the tables.")
+                try:
+                    table["fan_out"] = float(config.get(section, "fan_out", fallback="1"))
+                except ValueError:
+                    table["fan_out"] = 0
+                if not math.isfinite(table["fan_out"]) or table["fan_out"] <= 0:
+                    raise ConfigError(f"Invalid fan_out in section '{section}'. Must be a positive number.")
+                table["foreign_key"] = config.get(section, "foreign_key", fallback=f"{parent}_id")
+                if not table["foreign_key"].isidentifier() or table["foreign_key"] in value_fields + ["id"]:
+                    raise ConfigError(f"Invalid foreign_key in section '{section}'. Must be a new column name.")
+            tables[name] = table
+
+        # Order the tables so that every parent is generated before its children
+        try:
+            order = list(TopologicalSorter({name: [table["parent"]] if table["parent"] else []
+                                            for name, table in tables.items()}).static_order())
+        except CycleError as e:
+            raise ConfigError(f"The parents of the schema tables form a cycle: {' -> '.join(e.args[1])}")
+
+        # Child tables have fan_out rows per parent row
+        for name in order:
+            table = tables[name]
+            if table["parent"] is not None:
+                table["rows"] = max(1, round(tables[table["parent"]]["rows"] * table.pop("fan_out")))
+        return [tables[name] for name in order]
+
+    @staticmethod
+    def _get_column_groups(config, key, allow_surrogate=False):
+        """
+        Read an optional list of column groups from the 'table' section.
+
+        Args:
+            config (ConfigParser): The parsed configuration file.
+            key (str): The name of the option.
+            allow_surrogate (bool): Whether the generated surrogate key column 'id' is accepted.
+
+        Returns:
+            list: A list of column name tuples, empty if the option is not present.
+
+        Raises:
+            ConfigError: If a column is unknown.
+        """
+        known_columns = set(TableSpec.COLUMN_TYPES) - {TableSpec.SURROGATE_KEY}
+        if allow_surrogate:
+            known_columns.add(TableSpec.SURROGATE_KEY)
+
+        groups = []
+        for group in config.get("table", key, fallback="").split(","):
+            if not group.strip():
+                continue
+            columns = tuple(column.strip() for column in group.split("+"))
+            unknown_columns = [column for column in columns if column not in known_columns]
+            if unknown_columns:
+                raise ConfigError(f"Invalid {key} specified in the config file. Unknown columns: "
+                                  f"{', '.join(unknown_columns)}")
+            groups.append(columns)
+        return groups
+
+    @staticmethod
+    def _get_bool(config, section, key, default):
+        """
+        Read an optional boolean from the configuration.
+
+        Args:
+            config (ConfigParser): The parsed configuration file.
+            section (str): The section holding the option.
+            key (str): The name of the option.
+            default (bool): The value returned if the option is not present.
+
+        Returns:
+            bool: The validated value of the option.
+
+        Raises:
+            ConfigError: If the option is present and is not a boolean.
+        """
+        try:
+            return config.getboolean(section, key, fallback=default)
+        except ValueError:
+            raise ConfigError(f"Invalid {key} specified in the config file. Must be true or false.")
+
+    @staticmethod
+    def _get_positive_int(config, section, key, default):
+        """
+        Read an optional positive integer from the configuration.
+
+        Args:
+            config (ConfigParser): The parsed configuration file.
+            section (str): The section holding the option.
+            key (str): The name of the option.
+            default (int): The value returned if the option is not present.
+
+        Returns:
+            int: The validated value of the option.
+
+        Raises:
+            ConfigError: If the option is present and is not a positive integer.
+        """
+        value = config.get(section, key, fallback=None)
+        if value is None:
+            return default
+
+        try:
+            number = int(value)
+        except ValueError as e:
+            raise ConfigError(f"Invalid {key} specified in the config file. Must be a positive integer.") from e
+        if number < 1:
+            raise ConfigError(f"Invalid {key} specified in the config file. Must be a positive integer.")
+        return number
+
+    @staticmethod
+    def _get_choice(config, section, key, choices, default):
+        """
+        Read an optional option from the configuration that must be one of the given choices.
+
+        Args:
+            config (ConfigParser): The parsed configuration file.
+            section (str): The section holding the option.
+            key (str): The name of the option.
+            choices (tuple): The accepted values.
+            default (str): The value returned if the option is not present.
+
+        Returns:
+            str: The validated value of the option.
+
+        Raises:
+            ConfigError: If the option is present and is not one of the choices.
+        """
+        value = config.get(section, key, fallback=default)
+        if value not in choices:
+            raise ConfigError(f"Invalid {key} specified in the config file. Must be: {', '.join(choices)}.")
+        return value
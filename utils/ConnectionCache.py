@@ -0,0 +1,100 @@
+import asyncio
+
+
+class ConnectionCache:
+    """
+    Class keeping database connections and asyncio connection pools open between the jobs of one process.
+
+    Writers given a cache take their connection or pool from it and leave it open when they finish, so later jobs
+    loading into the same server skip connecting. Pools are bound to the event loop they were created on, so all
+    asynchronous jobs run on the cache's own event loop. A writer that fails discards its connection, as its state
+    is unknown. close closes everything.
+    """
+
+    def __init__(self):
+        # Open connections and pools by key, each with the function closing it
+        self.connections = {}
+        self.pools = {}
+        self.event_loop = None
+
+    def get_connection(self, key, connect, is_open):
+        """
+        Return the open connection stored under a key, connecting first if there is none.
+
+        Args:
+            key (tuple): The writer type and connection parameters.
+            connect (callable): A function without arguments returning a new connection.
+            is_open (callable): A function returning whether a connection is still usable.
+
+        Returns:
+            The connection.
+        """
+        connection = self.connections.get(key)
+        if connection is None or not is_open(connection):
+            connection = self.connections[key] = connect()
+        return connection
+
+    def discard_connection(self, key):
+        """
+        Close and forget the connection stored under a key, if any.
+        """
+        connection = self.connections.pop(key, None)
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    async def get_pool(self, key, create_pool, close_pool):
+        """
+        Return the pool stored under a key, creating it first if there is none.
+
+        Args:
+            key (tuple): The writer type, pool size and connection parameters.
+            create_pool (callable): A coroutine function without arguments returning a new pool.
+            close_pool (callable): A coroutine function closing the pool.
+
+        Returns:
+            The connection pool.
+        """
+        if key not in self.pools:
+            self.pools[key] = (await create_pool(), close_pool)
+        return self.pools[key][0]
+
+    async def discard_pool(self, key):
+        """
+        Close and forget the pool stored under a key, if any.
+        """
+        pool, close_pool = self.pools.pop(key, (None, None))
+        if pool is not None:
+            await close_pool(pool)
+
+    def run(self, coroutine):
+        """
+        Run a coroutine on the event loop of the cache, which is created on first use.
+
+        Args:
+            coroutine: The coroutine to run.
+
+        Returns:
+            The result of the coroutine.
+        """
+        if self.event_loop is None:
+            self.event_loop = asyncio.new_event_loop()
+        return self.event_loop.run_until_complete(coroutine)
+
+    def close(self):
+        """
+        Close all connections, pools and the event loop.
+
+        Returns:
+            None
+        """
+        for key in list(self.connections):
+            self.discard_connection(key)
+
+        if self.event_loop is not None:
+            for key in list(self.pools):
+                self.event_loop.run_until_complete(self.discard_pool(key))
+            self.event_loop.close()
+            self.event_loop = None
@@ -0,0 +1,58 @@
+class ContactBatch:
+    """
+    Class representing a chunk of generated contact data stored column by column.
+    """
+
+    def __init__(self, columns, size):
+        """
+        Initialize ContactBatch with column arrays and the number of rows they hold.
+
+        Args:
+            columns (dict): A dictionary mapping each field name to a list of values, one per row.
+                            The dictionary order defines the column order of the batch.
+            size (int): The number of rows in the batch.
+        """
+        self.columns = columns
+        self.size = size
+
+        # Time spent generating the batch, set by the pipeline
+        self.generation_seconds = 0.0
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def fields(self):
+        """
+        Return the field names of the batch in column order.
+
+        Returns:
+            list: The names of the columns in the batch.
+        """
+        return list(self.columns)
+
+    def rows(self):
+        """
+        Return an iterator over the rows of the batch.
+
+        The rows are built lazily by zipping the column arrays, so no intermediate per-row dictionaries are created.
+
+        Returns:
+            iterator: An iterator of tuples, one per row, with values in column order.
+        """
+        return zip(*self.columns.values())
+
+    def slice(self, start, stop=None):
+        """
+        Return a new batch with the rows from start to stop.
+
+        Args:
+            start (int): The index of the first row.
+            stop (int): The index after the last row, defaults to the end of the batch.
+
+        Returns:
+            ContactBatch: The batch with the selected rows.
+        """
+        stop = self.size if stop is None else min(stop, self.size)
+        columns = {field: values[start:stop] for field, values in self.columns.items()}
+        return ContactBatch(columns, max(0, stop - start))
@@ -1,5 +1,17 @@
 from faker import Faker
+from collections import Counter
+from datetime import date, timedelta
+from itertools import accumulate, compress
+from operator import and_
+import csv
+import math
+import os
 import random
+import re
+
+from utils.AliasTable import AliasTable
+from utils.ContactBatch import ContactBatch
+from utils.ValuePool import ValuePool
 
 
 class ContactGenerator:
@@ -7,7 +19,64 @@ class ContactGenerator:
     Class for generating contact data based on given probabilities.
     """
 
-    def __init__(self, faker, probabilities):
+    # Order of the fields in the generated contact data
+    FIELDS = ("first_name", "last_name", "date_of_birth", "email", "phone", "street_address_1", "street_address_2",
+              "city", "state_province", "postal_code", "country")
+
+    # Additional fields that can be generated instead of or next to the contact fields, e.g. for the tables of a
+    # relational schema
+    EXTRA_FIELDS = ("company", "phone_type")
+
+    # Values of the phone_type field
+    PHONE_TYPES = ("mobile", "home", "work")
+
+    # Fields that can be generated unique. Their values are built from the row index, so uniqueness holds for any
+    # number of rows without keeping the generated values.
+    UNIQUE_FIELDS = ("email", "phone")
+
+    # Number of distinct unique phone numbers, all 10 digit numbers
+    PHONE_RANGE = 10 ** 10
+
+    # Multiplier of the affine permutation of unique phone numbers, coprime to PHONE_RANGE so that every row index
+    # below PHONE_RANGE maps to a different number
+    PHONE_MULTIPLIER = 7_919_123_457
+
+    # Offset of the unique phone numbers of unseeded runs, seeded runs derive it from the seed
+    PHONE_OFFSET = 2_718_281_828
+
+    # Fields drawn together from one place of a place table, so that state and postal code match the city
+    PLACE_FIELDS = ("city", "state_province", "postal_code", "country")
+
+    # Fields that can follow a weighted distribution of single values, with their maximum lengths
+    CATEGORICAL_FIELDS = {"first_name": 20, "last_name": 20, "street_address_2": 40, "city": 40, "state_province": 20,
+                          "postal_code": 10, "country": 40, "company": 40, "phone_type": 10}
+
+    # Share of each age group (first age, last age, weight) of the default age pyramid, roughly the age structure
+    # of a European population
+    DEFAULT_AGE_PYRAMID = ((0, 14, 15), (15, 24, 10), (25, 44, 26), (45, 64, 28), (65, 84, 18), (85, 100, 3))
+
+    # Highest age of an age pyramid
+    MAX_AGE = 120
+
+    # Supported engines used by generate_batch
+    ENGINES = ("faker", "pool")
+
+    # Faker providers of the methods used by both engines, the only ones loaded by create_faker
+    FAKER_PROVIDERS = ("faker.providers.person", "faker.providers.address", "faker.providers.internet",
+                       "faker.providers.phone_number", "faker.providers.date_time", "faker.providers.company")
+
+    # Faker method called by a '{{method}}' token of a provider format
+    FORMAT_TOKEN = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+    # Faker methods tried in order for values that not every locale provides under the same name. Fields whose
+    # methods a locale doesn't have at all are left empty for the rows of that locale.
+    FAKER_METHODS = {
+        "state": ("state", "administrative_unit"),
+        "zipcode": ("zipcode", "postcode"),
+    }
+
+    def __init__(self, faker, probabilities, engine="faker", pool_size=10000, seed=None, shard_size=20000,
+                 locales=None, fields=None, unique=(), distributions=None):
         """
         Initialize ContactDataGenerator with a Faker instance and probabilities.
 
@@ -15,46 +84,775 @@ class ContactGenerator:
             faker (Faker): A Faker instance used to generate the fake data.
             probabilities (dict): A dictionary containing the probability of generating
                                  each field in the contact data.
+            engine (str): The engine used by generate_batch. Either 'faker' (call Faker for every value)
+                          or 'pool' (sample from value pools built once at startup).
+            pool_size (int): The number of Faker calls used to build each value pool of the 'pool' engine.
+            seed (int): If given, the output is reproducible. Every shard of shard_size rows is generated from
+                        its own seed derived from this one, so the output does not depend on how shards are
+                        distributed between processes.
+            shard_size (int): The number of rows in one independently seeded shard.
+            locales (dict): If given, a weighted mix of Faker locales, e.g. {'de_DE': 0.4, 'fr_FR': 0.6}. A Faker
+                            instance and producers (or value pools) are built once per locale and the rows of every
+                            batch are assigned to the locales in one bulk draw. Without locales, the given faker is
+                            used for all rows.
+            fields (tuple): If given, the fields to generate, in order, from FIELDS and EXTRA_FIELDS. Only their
+                            value pools are built. Defaults to FIELDS.
+            unique (tuple): Fields from UNIQUE_FIELDS whose values are unique across all generated rows.
+            distributions (dict): If given, weighted and correlated distributions, see _apply_distributions.
         """
+        if engine not in self.ENGINES:
+            raise ValueError(f"Invalid engine '{engine}'. Must be one of: {', '.join(self.ENGINES)}.")
+
+        # The generated fields replace the class default for this instance
+        if fields:
+            unknown_fields = [field for field in fields if field not in self.FIELDS + self.EXTRA_FIELDS]
+            if unknown_fields:
+                raise ValueError(f"Invalid fields: {', '.join(unknown_fields)}.")
+            self.FIELDS = tuple(fields)
+
+        self._check_unique(unique)
+
         self.faker = faker
         self.probabilities = probabilities
+        self.engine = engine
+        self.pool_size = pool_size
+        self.seed = seed
+        self.shard_size = shard_size
+        self.locales = locales
+        self.fields = fields
+        self.unique = tuple(unique)
+        self.distributions = distributions
+        self.random = random.Random(seed)
+
+        # Index of the next generated row, which unique values are built from
+        self.next_row = 0
+
+        # Offset of the unique phone numbers, the same in every process without a seed so that shards generated by
+        # different processes use the same permutation
+        self.phone_offset = self.PHONE_OFFSET
+        if seed is not None:
+            self.phone_offset = random.Random(f"{seed}:phone").randrange(self.PHONE_RANGE)
+
+        # One Faker instance per locale, built once and reused for every batch
+        if locales:
+            self.fakers = [self.create_faker(locale) for locale in locales]
+            self.locale_cum_weights = list(accumulate(locales.values()))
+        else:
+            self.fakers = [faker]
+
+        # Seed Faker before the value pools are built so that every process builds identical pools
+        if seed is not None:
+            if locales:
+                for locale, locale_faker in zip(locales, self.fakers):
+                    locale_faker.seed_instance(f"{seed}:{locale}")
+            else:
+                self.faker.seed_instance(seed)
+
+        # Functions producing a list of k values for each field and locale, used by generate_batch
+        if engine == "pool":
+            dates = self._build_date_pool() if "date_of_birth" in self.FIELDS else None
+            self.locale_producers = [self._build_pool_producers(locale_faker, dates) for locale_faker in self.fakers]
+        else:
+            self.locale_producers = [self._build_faker_producers(locale_faker) for locale_faker in self.fakers]
+        self.producers = self.locale_producers[0]
+
+        # Weighted distributions replace the producers of their fields, built last so that they don't change the
+        # value pools
+        self.place_fields = ()
+        self.null_groups = ()
+        if distributions:
+            self._apply_distributions(distributions)
+
+    @classmethod
+    def from_settings(cls, settings):
+        """
+        Create a ContactGenerator, including its Faker instance, from a settings dictionary.
+
+        This is used to build identical generators in worker processes, where the generator itself can't be shared.
+
+        Args:
+            settings (dict): The keyword arguments of the constructor, without 'faker'.
+
+        Returns:
+            ContactGenerator: A new generator.
+        """
+        return cls(cls.create_faker(), **settings)
+
+    @classmethod
+    def create_faker(cls, locale=None):
+        """
+        Create a Faker instance with only the providers the generator uses.
+
+        Loading a handful of providers instead of all of them makes the instance much cheaper to build, while the
+        generated values are the same as with a default Faker instance. Locales whose formats use methods of other
+        providers, e.g. the street addresses of en_PH, get a Faker instance with all providers instead.
+
+        Args:
+            locale (str): The Faker locale, e.g. 'de_DE'. Defaults to Faker's default locale.
+
+        Returns:
+            Faker: A new Faker instance.
+        """
+        faker = Faker(locale, providers=list(cls.FAKER_PROVIDERS))
+        if cls._missing_formatters(faker):
+            return Faker(locale)
+        return faker
+
+    @classmethod
+    def _missing_formatters(cls, faker):
+        """
+        Return the methods that the formats of the loaded providers use but no loaded provider has.
+
+        Returns:
+            set: The names of the missing methods, empty if every format can be generated.
+        """
+        missing = set()
+        for provider in faker.providers:
+            for name in dir(provider):
+                formats = getattr(provider, name) if name.endswith("_formats") else None
+                if not isinstance(formats, (list, tuple, dict)):
+                    continue
+                for format_string in formats:
+                    if isinstance(format_string, str):
+                        missing.update(method for method in cls.FORMAT_TOKEN.findall(format_string)
+                                       if not hasattr(faker, method))
+        return missing
+
+    def get_settings(self):
+        """
+        Return the settings needed to recreate this generator with from_settings.
+
+        Returns:
+            dict: The keyword arguments of the constructor, without 'faker'.
+        """
+        return {
+            "probabilities": self.probabilities,
+            "engine": self.engine,
+            "pool_size": self.pool_size,
+            "seed": self.seed,
+            "shard_size": self.shard_size,
+            "locales": self.locales,
+            "fields": self.fields,
+            "unique": self.unique,
+            "distributions": self.distributions,
+        }
+
+    def with_options(self, probabilities, unique=(), shard_size=None):
+        """
+        Return a generator sharing the Faker instances, value pools and distributions of this one, with other
+        probabilities, unique fields and shard size.
+
+        Building these is most of the cost of a new generator, so jobs that differ only in these settings reuse
+        a warmed generator instead. The returned generator starts at row 0; both must not be used concurrently.
+
+        Args:
+            probabilities (dict): The probability of generating each field.
+            unique (tuple): Fields from UNIQUE_FIELDS whose values are unique across all generated rows.
+            shard_size (int): The number of rows in one independently seeded shard, defaults to the current one.
+
+        Returns:
+            ContactGenerator: The new generator.
+        """
+        self._check_unique(unique)
+        # Copy the attributes directly, copy.copy would pickle by settings and rebuild everything
+        generator = object.__new__(type(self))
+        generator.__dict__.update(self.__dict__)
+        generator.probabilities = probabilities
+        generator.unique = tuple(unique)
+        generator.shard_size = shard_size or self.shard_size
+        generator.next_row = 0
+        return generator
+
+    def __reduce__(self):
+        # Pickle by settings, the Faker instance and value pools are rebuilt when unpickled
+        return self.from_settings, (self.get_settings(),)
 
     def generate_contact_data(self):
         """
-        Generate contact data based on given probabilities.
+        Generate the contact data of a single row.
 
-        This method generates a dictionary containing fake contact data using the
-        Faker library. Each field of the contact data is generated with the probability
-        specified in the 'probabilities' dictionary.
+        The row is generated like a batch of one, so it follows every setting of the generator, e.g. locales,
+        fields, unique values and distributions.
 
         Returns:
             dict: A dictionary containing the generated contact data.
         """
+        batch = self.generate_batch(1)
+        return {field: values[0] for field, values in batch.columns.items()}
+
+    def generate_batch(self, number_of_rows):
+        """
+        Generate contact data for a chunk of rows, column by column.
+
+        For every field a null-mask for the whole chunk is drawn in a single call, then values are produced only
+        for the rows whose mask is on. Fields that are always populated skip the mask draw entirely, and fields
+        whose mask is off for every row are never generated. With several locales, the locale of every row is drawn
+        once for the whole chunk and each locale produces the values of its rows in one call. With a place table,
+        one place is drawn per row and the place fields of the row are taken from it. Unique fields are finally
+        made unique with the index of their rows.
+
+        Args:
+            number_of_rows (int): The number of rows to generate.
+
+        Returns:
+            ContactBatch: A batch holding one list of values per field.
+        """
+        columns = {}
+        row_locales = self._draw_locales(number_of_rows)
+        group_masks = self._draw_group_masks(number_of_rows) if self.null_groups else {}
+        row_places = self._produce("place", number_of_rows, row_locales) if self.place_fields else None
+
+        for field in self.FIELDS:
+            mask = group_masks[field] if field in group_masks else self._draw_mask(field, number_of_rows)
+
+            # Take the value of the row's place, except where the field is empty
+            if row_places is not None and field in self.place_fields:
+                position = self.place_fields.index(field)
+                if mask is None:
+                    columns[field] = [place[position] for place in row_places]
+                else:
+                    columns[field] = [place[position] if is_set else None for place, is_set in zip(row_places, mask)]
+                continue
+
+            # Every row is populated, produce the whole column at once
+            if mask is None:
+                columns[field] = self._produce(field, number_of_rows, row_locales)
+                continue
+
+            # Produce values only for populated rows and scatter them into the column
+            populated = mask.count(True)
+            if populated == 0:
+                columns[field] = [None] * number_of_rows
+                continue
+
+            populated_locales = None if row_locales is None else list(compress(row_locales, mask))
+            values = iter(self._produce(field, populated, populated_locales))
+            columns[field] = [next(values) if is_set else None for is_set in mask]
+
+        # Build the values of unique fields from the row indexes of the batch
+        for field in self.unique:
+            if field in columns:
+                columns[field] = self._make_unique(field, columns[field], self.next_row)
+        self.next_row += number_of_rows
+
+        return ContactBatch(columns, number_of_rows)
+
+    def iter_batches(self, number_of_rows, batch_size, start_row=0):
+        """
+        Generate contact data for the given number of rows as a sequence of batches.
+
+        With start_row, generation starts at the shard containing that row and the rows of the shard before it are
+        dropped, so with a seed the batches continue exactly where a complete run would be at that row.
+
+        Args:
+            number_of_rows (int): The total number of rows to generate.
+            batch_size (int): The maximum number of rows in a single batch.
+            start_row (int): The index of the first row to return.
+
+        Yields:
+            ContactBatch: The generated batches, the last one may be smaller than batch_size.
+        """
+        first_shard = start_row // self.shard_size
+        for shard_index, shard_rows in self.split_into_shards(number_of_rows, self.shard_size)[first_shard:]:
+            batches = self.generate_shard(shard_index, shard_rows, batch_size)
+            if shard_index == first_shard:
+                batches = self.skip_rows(batches, start_row - first_shard * self.shard_size)
+            yield from batches
+
+    def generate_shard(self, shard_index, number_of_rows, batch_size):
+        """
+        Generate one shard of contact data as a sequence of batches.
+
+        If the generator has a seed, the random state is reset from a seed derived from the shard index first,
+        so the shard always contains the same rows regardless of which process generates it. The rows depend on
+        the batch size, as the values and null masks are drawn batch by batch.
+
+        Args:
+            shard_index (int): The position of the shard in the output.
+            number_of_rows (int): The number of rows in the shard.
+            batch_size (int): The maximum number of rows in a single batch.
+
+        Yields:
+            ContactBatch: The generated batches of the shard.
+        """
+        if self.seed is not None:
+            self.reseed(f"{self.seed}:{shard_index}")
+        self.next_row = shard_index * self.shard_size
+
+        remaining = number_of_rows
+        while remaining > 0:
+            size = min(batch_size, remaining)
+            yield self.generate_batch(size)
+            remaining -= size
+
+    def reseed(self, seed):
+        """
+        Reset the random state of the generator and of its Faker instances from a seed.
+
+        Args:
+            seed: The new seed, e.g. derived from the shard index or drawn from the operating system.
+
+        Returns:
+            None
+        """
+        self.random.seed(seed)
+        for locale_faker in self.fakers:
+            locale_faker.seed_instance(self.random.getrandbits(64))
+
+    @staticmethod
+    def skip_rows(batches, number_of_rows):
+        """
+        Drop the given number of rows from the start of a sequence of batches.
+
+        Args:
+            batches (iterable): The batches.
+            number_of_rows (int): The number of rows to drop.
+
+        Yields:
+            ContactBatch: The remaining batches, the first one cut if it held dropped rows.
+        """
+        for batch in batches:
+            if number_of_rows >= len(batch):
+                number_of_rows -= len(batch)
+                continue
+            if number_of_rows:
+                batch = batch.slice(number_of_rows)
+                number_of_rows = 0
+            yield batch
+
+    @staticmethod
+    def split_into_shards(number_of_rows, shard_size):
+        """
+        Split the given number of rows into shards of shard_size rows.
+
+        Args:
+            number_of_rows (int): The total number of rows.
+            shard_size (int): The number of rows in one shard, the last shard may be smaller.
+
+        Returns:
+            list: A list of (shard_index, number_of_rows_in_shard) tuples.
+        """
+        return [(index, min(shard_size, number_of_rows - start))
+                for index, start in enumerate(range(0, number_of_rows, shard_size))]
+
+    def _draw_mask(self, field, number_of_rows):
+        """
+        Draw the null-mask of a field for a chunk of rows with one bulk random draw.
+
+        Args:
+            field (str): The name of the field.
+            number_of_rows (int): The number of rows in the chunk.
+
+        Returns:
+            list or None: A list of booleans, True where the field should be populated,
+                          or None if the field is populated in every row.
+        """
+        probability = self.probabilities.get(field, 1)
+        if probability >= 1:
+            return None
+        return self.random.choices((True, False), cum_weights=(probability, 1), k=number_of_rows)
+
+    def _draw_group_masks(self, number_of_rows):
+        """
+        Draw the null-masks of the fields in null groups, which are empty in every row where the first field of
+        their group is empty.
+
+        The other fields of a group are populated with their probability divided by the one of the first field, so
+        each field keeps its configured probability as long as it doesn't exceed the one of the first field.
+
+        Args:
+            number_of_rows (int): The number of rows in the chunk.
+
+        Returns:
+            dict: The mask of every generated field of the groups, None for fields populated in every row.
+        """
+        masks = {}
+        for lead, *members in self.null_groups:
+            lead_mask = masks[lead] = self._draw_mask(lead, number_of_rows)
+            lead_probability = self.probabilities.get(lead, 1)
+
+            for field in members:
+                # Without empty rows of the first field, the field is independent
+                if lead_mask is None:
+                    masks[field] = self._draw_mask(field, number_of_rows)
+                    continue
+
+                probability = self.probabilities.get(field, 1) / lead_probability if lead_probability else 0
+                if probability >= 1:
+                    masks[field] = lead_mask
+                else:
+                    own_mask = self.random.choices((True, False), cum_weights=(probability, 1), k=number_of_rows)
+                    masks[field] = list(map(and_, lead_mask, own_mask))
+        return masks
+
+    def _draw_locales(self, number_of_rows):
+        """
+        Assign the rows of a chunk to the configured locales with one bulk weighted draw.
+
+        Args:
+            number_of_rows (int): The number of rows in the chunk.
+
+        Returns:
+            list or None: The index of the locale of every row, or None if there is only one locale.
+        """
+        if len(self.fakers) == 1:
+            return None
+        return self.random.choices(range(len(self.fakers)), cum_weights=self.locale_cum_weights, k=number_of_rows)
+
+    def _produce(self, field, number_of_values, value_locales):
+        """
+        Produce values of a field, each from the producer of its locale.
+
+        Args:
+            field (str): The name of the field.
+            number_of_values (int): The number of values.
+            value_locales (list): The locale index of every value, or None if there is only one locale.
+
+        Returns:
+            list: The produced values.
+        """
+        if value_locales is None:
+            return self.producers[field](number_of_values)
+
+        # Produce the values of every locale at once, then pick them in row order
+        counts = Counter(value_locales)
+        values = [iter(self.locale_producers[locale][field](counts[locale])) if counts[locale] else None
+                  for locale in range(len(self.fakers))]
+        return list(map(next, map(values.__getitem__, value_locales)))
+
+    @classmethod
+    def _check_unique(cls, unique):
+        """
+        Raise a ValueError if a unique field is not one of UNIQUE_FIELDS.
+        """
+        unknown_unique = [field for field in unique if field not in cls.UNIQUE_FIELDS]
+        if unknown_unique:
+            raise ValueError(f"Invalid unique fields: {', '.join(unknown_unique)}. "
+                             f"Must be one of: {', '.join(cls.UNIQUE_FIELDS)}.")
+
+    def _make_unique(self, field, values, first_row):
+        """
+        Make the values of a column unique by building them from the index of their row.
 
-        # Dictionary with contact data
-        contact_data = {
-            "first_name": self.faker.first_name()[:20],
-            "last_name": self.faker.last_name()[:20],
-            "date_of_birth": self.faker.date(pattern="%Y-%m-%d") if random.random() <= self.probabilities.get(
-                "date_of_birth", 1) else None,
-            "email": (
-                self.faker.email() if "@" in self.faker.email() else "user@example.com") if random.random() <=
-                                                                                            self.probabilities.get(
-                                                                                                "email", 1) else None,
-            "phone": ''.join(filter(str.isdigit, self.faker.phone_number()))[:10] if random.random() <=
-                                                                                     self.probabilities.get("phone", 1)
-            else None,
-            "street_address_1": self.faker.street_address()[:40] if random.random() <= self.probabilities.get(
-                "street_address_1", 1) else None,
-            "street_address_2": self.faker.secondary_address()[:40] if random.random() <= self.probabilities.get(
-                "street_address_2", 1) else None,
-            "city": self.faker.city()[:40] if random.random() <= self.probabilities.get("city", 1) else None,
-            "state_province": self.faker.state()[:20] if random.random() <= self.probabilities.get("state_province",
-                                                                                                   1) else None,
-            "postal_code": self.faker.zipcode()[:10] if random.random() <= self.probabilities.get("postal_code",
-                                                                                                  1) else None,
-            "country": self.faker.country()[:40] if random.random() <= self.probabilities.get("country", 1) else None
+        Emails get the hexadecimal row index appended to their local part, which no other row can produce, and
+        phone numbers are the row index mapped by an affine permutation of all 10 digit numbers. Nothing is stored,
+        so memory use does not grow with the number of rows.
+
+        Args:
+            field (str): The name of the field, 'email' or 'phone'.
+            values (list): The column, with None for empty values.
+            first_row (int): The index of the first row of the column.
+
+        Returns:
+            list: The unique values, still None where the column is empty.
+        """
+        if field == "email":
+            unique_email = self._unique_email
+            return [None if value is None else unique_email(value, row) for row, value in enumerate(values, first_row)]
+
+        multiplier, offset, phone_range = self.PHONE_MULTIPLIER, self.phone_offset, self.PHONE_RANGE
+        return [None if value is None else f"{(row * multiplier + offset) % phone_range:010d}"
+                for row, value in enumerate(values, first_row)]
+
+    @staticmethod
+    def _unique_email(email, row):
+        """
+        Return the email with the hexadecimal row index appended to its local part, e.g. 'jsmith.3e8@example.org'.
+        """
+        local_part, _, domain = email.rpartition("@")
+        if not local_part or not domain:
+            local_part, domain = "user", "example.com"
+        return f"{local_part}.{row:x}@{domain}"
+
+    @classmethod
+    def _faker_method(cls, faker, name):
+        """
+        Return the Faker method for a value, trying the alternatives in FAKER_METHODS.
+
+        Returns:
+            callable or None: The bound method, or None if the locale of the Faker instance has none of them.
+        """
+        for method_name in cls.FAKER_METHODS.get(name, (name,)):
+            if hasattr(faker, method_name):
+                return getattr(faker, method_name)
+        return None
+
+    @staticmethod
+    def _valid_email(email):
+        """
+        Return the given email, or a placeholder if it is not a valid address.
+        """
+        return email if "@" in email else "user@example.com"
+
+    def _build_faker_producers(self, faker):
+        """
+        Build the functions producing column values with the Faker library.
+
+        The Faker methods are looked up once here instead of once per row.
+
+        Args:
+            faker (Faker): The Faker instance of one locale.
+
+        Returns:
+            dict: A dictionary mapping each field name to a function that returns a list of k values.
+        """
+        first_name, last_name, email = faker.first_name, faker.last_name, faker.email
+        city, country, date = faker.city, faker.country, faker.date
+        phone_number, street_address, secondary_address, state, zipcode, company = (
+            self._faker_method(faker, name)
+            for name in ("phone_number", "street_address", "secondary_address", "state", "zipcode", "company"))
+
+        producers = {
+            "first_name": lambda k: [first_name()[:20] for _ in range(k)],
+            "last_name": lambda k: [last_name()[:20] for _ in range(k)],
+            "date_of_birth": lambda k: [date(pattern="%Y-%m-%d") for _ in range(k)],
+            "email": lambda k: [self._valid_email(email()) for _ in range(k)],
+            "phone": lambda k: [''.join(filter(str.isdigit, phone_number()))[:10] for _ in range(k)],
+            "street_address_1": lambda k: [street_address()[:40] for _ in range(k)],
+            "street_address_2": lambda k: [secondary_address()[:40] for _ in range(k)],
+            "city": lambda k: [city()[:40] for _ in range(k)],
+            "state_province": lambda k: [state()[:20] for _ in range(k)],
+            "postal_code": lambda k: [zipcode()[:10] for _ in range(k)],
+            "country": lambda k: [country()[:40] for _ in range(k)],
+            "company": lambda k: [company()[:40] for _ in range(k)],
+            "phone_type": lambda k: self.random.choices(self.PHONE_TYPES, k=k),
         }
 
-        # Return the dictionary
-        return contact_data
+        # Leave the fields empty that the locale has no method for
+        for field, method in (("phone", phone_number), ("street_address_1", street_address),
+                              ("street_address_2", secondary_address), ("state_province", state),
+                              ("postal_code", zipcode), ("company", company)):
+            if method is None:
+                producers[field] = lambda k: [None] * k
+        return producers
+
+    def _build_pool_producers(self, faker, dates):
+        """
+        Build the functions producing column values by sampling precomputed value pools.
+
+        Every pool is built once from Faker output, truncated to the same lengths as the faker engine and
+        deduplicated. Street addresses are pooled whole, so they follow the address formats of the locale. Email
+        addresses and phone numbers are assembled from separately sampled parts, so the output keeps the shape of
+        the Faker engine.
+
+        Args:
+            faker (Faker): The Faker instance of one locale.
+            dates (ValuePool): The pool of dates of birth, shared by all locales.
+
+        Returns:
+            dict: A dictionary mapping each field name to a function that returns a list of k values.
+        """
+        size, rng, fields = self.pool_size, self.random, set(self.FIELDS)
+
+        def pool(field, method, max_length=None):
+            # Pools are only built for generated fields, and not if the locale has no method for the value
+            if field not in fields or method is None:
+                return None
+            return ValuePool.from_callable(method, size, max_length)
+
+        first_names = pool("first_name", faker.first_name, 20)
+        last_names = pool("last_name", faker.last_name, 20)
+        street_addresses = pool("street_address_1", self._faker_method(faker, "street_address"), 40)
+        secondary_addresses = pool("street_address_2", self._faker_method(faker, "secondary_address"), 40)
+        cities = pool("city", faker.city, 40)
+        states = pool("state_province", self._faker_method(faker, "state"), 20)
+        postal_codes = pool("postal_code", self._faker_method(faker, "zipcode"), 10)
+        countries = pool("country", faker.country, 40)
+        user_names = pool("email", faker.user_name)
+        email_domains = pool("email", faker.free_email_domain)
+        phone_number = self._faker_method(faker, "phone_number")
+        phone_prefixes = pool("phone", phone_number and (lambda: ''.join(filter(str.isdigit, phone_number()))[:3]))
+        companies = pool("company", self._faker_method(faker, "company"), 40)
+
+        def email(k):
+            return [f"{user}@{domain}" for user, domain in zip(user_names.sample(k, rng), email_domains.sample(k, rng))]
+
+        def phone(k):
+            randrange = rng.randrange
+            return [f"{prefix}{randrange(10000000):07d}"[:10] for prefix in phone_prefixes.sample(k, rng)]
+
+        producers = {
+            "first_name": lambda k: first_names.sample(k, rng),
+            "last_name": lambda k: last_names.sample(k, rng),
+            "date_of_birth": lambda k: dates.sample(k, rng),
+            "email": email,
+            "phone": phone,
+            "street_address_1": lambda k: street_addresses.sample(k, rng),
+            "street_address_2": lambda k: secondary_addresses.sample(k, rng),
+            "city": lambda k: cities.sample(k, rng),
+            "state_province": lambda k: states.sample(k, rng),
+            "postal_code": lambda k: postal_codes.sample(k, rng),
+            "country": lambda k: countries.sample(k, rng),
+            "company": lambda k: companies.sample(k, rng),
+            "phone_type": lambda k: rng.choices(self.PHONE_TYPES, k=k),
+        }
+
+        # Leave the fields empty that the locale has no method for
+        for field, values in (("phone", phone_prefixes), ("street_address_1", street_addresses),
+                              ("street_address_2", secondary_addresses), ("state_province", states),
+                              ("postal_code", postal_codes), ("company", companies)):
+            if values is None:
+                producers[field] = lambda k: [None] * k
+        return producers
+
+    def _apply_distributions(self, distributions):
+        """
+        Replace the uniform values of fields by weighted and correlated distributions drawn from alias tables.
+
+        Supported keys, all optional:
+            places: 'zipf' for a table of places (city, state, postal code and country generated together) with
+                    Zipf weights by rank, like city populations, or the path of a ';' separated file with a header
+                    naming any of PLACE_FIELDS and 'weight'. The place fields of a row are taken from one place.
+            fields: Maps fields of CATEGORICAL_FIELDS to 'zipf' (the generated values with Zipf weights) or the path
+                    of a ';' separated 'value;weight' file.
+            zipf_exponent: The exponent of the Zipf weights, 1.0 by default.
+            age_pyramid: (first age, last age, weight) groups that the date of birth follows.
+            null_groups: Field tuples that are empty together, see _draw_group_masks.
+            cache_dir: The directory caching the tables between runs, or None.
+
+        Args:
+            distributions (dict): The distributions loaded by ConfigLoader.
+        """
+        cache_dir = distributions.get("cache_dir")
+        exponent = distributions.get("zipf_exponent", 1.0)
+        rng = self.random
+
+        def sampler(table):
+            return lambda k: table.sample(k, rng)
+
+        # Dates of birth following the age pyramid, shared by all locales
+        if distributions.get("age_pyramid") and "date_of_birth" in self.FIELDS:
+            dates = sampler(self._build_age_table(distributions["age_pyramid"]))
+            for producers in self.locale_producers:
+                producers["date_of_birth"] = dates
+
+        # Place fields drawn together, from the columns of the place file or all generated place fields
+        places = distributions.get("places")
+        if places == "zipf":
+            self.place_fields = tuple(field for field in self.PLACE_FIELDS if field in self.FIELDS)
+        elif places:
+            with open(places, newline="", encoding="utf-8") as places_file:
+                header = next(csv.reader(places_file, delimiter=";"), [])
+            self.place_fields = tuple(field for field in header if field in self.PLACE_FIELDS and field in self.FIELDS)
+
+        locale_names = list(self.locales) if self.locales else [None]
+        for locale, producers in zip(locale_names, self.locale_producers):
+            # Generated tables depend on everything that determines the generated values
+            generated_key = f"{locale}:{self.engine}:{self.pool_size}:{self.seed}:{exponent}"
+
+            if self.place_fields:
+                # Places are tuples of the place fields, a table with other fields or another order doesn't fit
+                place_key = f"places:{'+'.join(self.place_fields)}"
+                if places == "zipf":
+                    table = AliasTable.cached(cache_dir, f"{place_key}:{generated_key}", lambda: AliasTable.zipf(
+                        self._generate_values([producers[field] for field in self.place_fields]), exponent))
+                else:
+                    table = AliasTable.cached(cache_dir, f"{place_key}:{self._file_key(places)}",
+                                              lambda: self._read_table(places, self.place_fields))
+                producers["place"] = sampler(table)
+
+            for field, source in (distributions.get("fields") or {}).items():
+                if field not in self.FIELDS or field in self.place_fields:
+                    continue
+                if source == "zipf":
+                    table = AliasTable.cached(cache_dir, f"{field}:{generated_key}", lambda: AliasTable.zipf(
+                        [value for value, in self._generate_values([producers[field]])], exponent))
+                else:
+                    table = AliasTable.cached(cache_dir, f"{field}:{self._file_key(source)}",
+                                              lambda: self._read_table(source, ("value",), field))
+                producers[field] = sampler(table)
+
+        # Only the generated fields of the null groups, skipping groups left with a single field
+        self.null_groups = tuple(group for group in (tuple(field for field in group if field in self.FIELDS)
+                                                     for group in distributions.get("null_groups") or ())
+                                 if len(group) > 1)
+
+    def _generate_values(self, producers):
+        """
+        Generate up to pool_size value tuples, one value from each producer, in the order of first occurrence.
+
+        Tuples are distinct in their first value, so that e.g. a city always comes with the same state and postal
+        code.
+        """
+        values = {}
+        for row_values in zip(*(producer(self.pool_size) for producer in producers)):
+            values.setdefault(row_values[0], row_values)
+        return list(values.values())
+
+    @classmethod
+    def _read_table(cls, path, columns, field=None):
+        """
+        Read the weighted values of a ';' separated file with a header into an alias table.
+
+        Args:
+            path (str): The path of the file.
+            columns (tuple): The columns of the drawn values, each a field of the table or 'value'.
+            field (str): For a 'value' column, the field whose maximum length it is truncated to.
+
+        Returns:
+            AliasTable: The table of value tuples, or of single values for a 'value' column.
+
+        Raises:
+            ValueError: If the file has no rows or a weight is not a non-negative number.
+        """
+        values, weights = [], []
+        with open(path, newline="", encoding="utf-8") as table_file:
+            for line, row in enumerate(csv.DictReader(table_file, delimiter=";"), 2):
+                # Truncate the values like generated ones, empty values are nulls
+                row_values = tuple(row[column][:cls.CATEGORICAL_FIELDS[field or column]] if row.get(column) else None
+                                   for column in columns)
+                try:
+                    weight = float(row.get("weight") or 1)
+                except ValueError:
+                    weight = -1
+                if not math.isfinite(weight) or weight < 0:
+                    raise ValueError(f"Invalid weight in line {line} of {path}.")
+                weights.append(weight)
+                values.append(row_values[0] if field else row_values)
+
+        if not values:
+            raise ValueError(f"The distribution file {path} has no rows.")
+        return AliasTable(values, weights)
+
+    @staticmethod
+    def _file_key(path):
+        """
+        Return a cache key of a file that changes whenever the file does.
+        """
+        status = os.stat(path)
+        return f"{os.path.abspath(path)}:{status.st_size}:{status.st_mtime_ns}"
+
+    @staticmethod
+    def _build_age_table(age_pyramid):
+        """
+        Build the table of dates of birth following an age pyramid, with one entry per day.
+
+        Args:
+            age_pyramid (list): (first age, last age, weight) groups, the weight shared by the ages of the group.
+
+        Returns:
+            AliasTable: The dates in ISO format.
+        """
+        today = date.today().toordinal()
+        dates, weights = [], []
+        for first_age, last_age, weight in age_pyramid:
+            # Every day of the group gets the same share of its weight
+            first_day = round(first_age * 365.2425)
+            last_day = round((last_age + 1) * 365.2425)
+            day_weight = weight / (last_day - first_day)
+            for day in range(first_day, last_day):
+                dates.append(date.fromordinal(today - day).isoformat())
+                weights.append(day_weight)
+        return AliasTable(dates, weights)
+
+    @staticmethod
+    def _build_date_pool():
+        """
+        Build the pool of every date Faker's date() can return, from the epoch to today.
+
+        Returns:
+            ValuePool: The dates in ISO format.
+        """
+        first_day = date(1970, 1, 1)
+        return ValuePool((first_day + timedelta(days=offset)).isoformat()
+                         for offset in range((date.today() - first_day).days + 1))
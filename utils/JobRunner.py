@@ -0,0 +1,334 @@
+import json
+import os
+import random
+import sys
+import time
+
+from utils.Checkpoint import Checkpoint
+from utils.ConfigLoader import ConfigError, ConfigLoader
+from utils.ConnectionCache import ConnectionCache
+from utils.ContactGenerator import ContactGenerator
+from utils.ShardedGenerator import ShardedGenerator
+from utils.TableGenerator import TableGenerator
+from writers.BaseWriter import StreamClosedError
+
+
+class JobRunner:
+    """
+    Class for running the jobs of one or more configurations in a single process, the library API of the generator.
+
+    All jobs of a configuration are validated before the first one runs. Later jobs reuse what earlier ones have
+    built: generators with the same Faker and value pool settings are warmed only once, and database connections
+    and asyncio pools stay open for the next job loading into the same server. Invalid configurations raise
+    ConfigError instead of exiting, so callers can handle them.
+
+    Example:
+        with JobRunner() as runner:
+            runner.run_file("config.ini")
+    """
+
+    def __init__(self, start_time=None):
+        """
+        Initialize JobRunner.
+
+        Args:
+            start_time (float): The time.perf_counter() value at process start, to report the startup time of the
+                                first job. Defaults to the time the runner is created.
+        """
+        self.start_time = time.perf_counter() if start_time is None else start_time
+        self.connection_cache = ConnectionCache()
+
+        # Warmed generators by their settings, and whether a job has reported the startup time yet
+        self.generators = {}
+        self.started = False
+
+        # The StreamClosedError of every job whose reader closed its stream early
+        self.closed_streams = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Close the connections and pools kept open between jobs.
+
+        Returns:
+            None
+        """
+        self.connection_cache.close()
+        self.generators.clear()
+
+    def run_file(self, config_file_path, resume=False):
+        """
+        Load, validate and run all jobs of a configuration file.
+
+        Args:
+            config_file_path (str): The path of the configuration file.
+            resume (bool): True to resume the interrupted job, see run_jobs.
+
+        Raises:
+            ConfigError: If the configuration or any of its jobs is invalid. No job is run in that case.
+        """
+        self.run_jobs(ConfigLoader(config_file_path).load_jobs(), resume)
+
+    def run_jobs(self, jobs, resume=False):
+        """
+        Run jobs one after the other.
+
+        With resume, the jobs before the first one with a checkpoint file are taken as completed: that job is
+        resumed and the jobs after it run normally. A job whose reader closes the stream early (e.g. '| head') ends
+        without an error: its StreamClosedError is reported on stderr and kept in closed_streams, a closed stdout is
+        pointed at /dev/null, and the next job runs.
+
+        Args:
+            jobs (list): The jobs returned by ConfigLoader.load_jobs.
+            resume (bool): True to resume the interrupted job.
+
+        Raises:
+            ConfigError: If resume is set but no job has a checkpoint to resume.
+        """
+        if resume and len(jobs) > 1:
+            interrupted = [index for index, job in enumerate(jobs)
+                           if job["options"]["checkpoint_file"] and os.path.exists(job["options"]["checkpoint_file"])]
+            if not interrupted:
+                raise ConfigError("No checkpoint found for any job. There is no interrupted load to resume.")
+            jobs = jobs[interrupted[0]:]
+
+        for index, job in enumerate(jobs):
+            try:
+                self.run_job(job, resume and index == 0)
+            except StreamClosedError as e:
+                print(e, file=sys.stderr)
+                self.closed_streams.append(e)
+
+                # Later messages to stdout and its flush on exit would fail with a broken pipe
+                if e.target_name == "stdout":
+                    devnull = os.open(os.devnull, os.O_WRONLY)
+                    os.dup2(devnull, sys.stdout.fileno())
+                    os.close(devnull)
+
+    def run_job(self, job, resume=False):
+        """
+        Generate and write the contact data of one job.
+
+        Args:
+            job (dict): A job returned by ConfigLoader.load_jobs.
+            resume (bool): True if the interrupted load of the job should be resumed.
+
+        Returns:
+            None
+
+        Raises:
+            StreamClosedError: If the reader of a streamed output closes it before all rows have been written.
+        """
+        db_type, number_of_contacts, db_config = job["db_type"], job["number_of_contacts"], job["db_config"]
+
+        # Copy the options, so that running a job never changes it
+        options = dict(job["options"], connection_cache=self.connection_cache)
+
+        # Settings of the ContactGenerator
+        generator_settings = {
+            "probabilities": job["probabilities"],
+            "engine": options["engine"],
+            "pool_size": options["pool_size"],
+            "seed": options["seed"],
+            "shard_size": options["shard_size"],
+            "locales": options["locales"],
+            "unique": options["unique"],
+            "distributions": options["distributions"],
+        }
+
+        # Record the progress of database loads so that an interrupted load can be resumed
+        self.prepare_checkpoint(db_type, number_of_contacts, db_config, options, generator_settings, resume)
+
+        # Write the tables of a relational schema one after the other
+        if options["schema"]:
+            self.write_schema(db_type, db_config, generator_settings, options)
+            return
+
+        # Instantiate ContactGenerator, or a ShardedGenerator running one ContactGenerator per worker process
+        contact_generator = self.create_generator(generator_settings, options["workers"])
+
+        # Instantiate writer object and write the data
+        writer = self.writer_factory(db_type, number_of_contacts, db_config, contact_generator, options)
+        self._write(writer)
+
+    @staticmethod
+    def writer_factory(db_type, number_of_contacts, db_config, contact_generator, options=None):
+        """
+        Factory function to instantiate the correct writer class based on the 'db_type' parameter.
+
+        Args:
+            db_type (str): The type of the database. Either 'csv', 'mysql', 'postgresql', 'parquet', 'arrow' or
+                           'stream'.
+            number_of_contacts (int): The number of contacts for which data should be generated.
+            db_config (dict): A dictionary containing database connection parameters.
+            contact_generator (ContactDataGenerator): An instance of ContactDataGenerator to generate fake data.
+            options (dict): The generation options loaded by ConfigLoader, e.g. batch size, queue depth and table
+                            spec.
+
+        Returns:
+            An instance of the appropriate writer class.
+        """
+        # Writer modules are imported only for the selected db_type, so that only its driver is loaded
+        if db_type == 'csv':
+            from writers.CSVWriter import CSVWriter
+            return CSVWriter(number_of_contacts, contact_generator, options)
+        elif db_type == 'postgresql' and db_config.get("async_mode"):
+            from writers.AsyncPostgreSQLWriter import AsyncPostgreSQLWriter
+            return AsyncPostgreSQLWriter(number_of_contacts, db_config, contact_generator, options)
+        elif db_type == 'postgresql':
+            from writers.PostgreSQLWriter import PostgreSQLWriter
+            return PostgreSQLWriter(number_of_contacts, db_config, contact_generator, options)
+        elif db_type == 'mysql' and db_config.get("async_mode"):
+            from writers.AsyncMySQLWriter import AsyncMySQLWriter
+            return AsyncMySQLWriter(number_of_contacts, db_config, contact_generator, options)
+        elif db_type == 'mysql':
+            from writers.MySQLWriter import MySQLWriter
+            return MySQLWriter(number_of_contacts, db_config, contact_generator, options)
+        elif db_type == 'parquet':
+            from writers.ParquetWriter import ParquetWriter
+            return ParquetWriter(number_of_contacts, contact_generator, options)
+        elif db_type == 'arrow':
+            from writers.ArrowWriter import ArrowWriter
+            return ArrowWriter(number_of_contacts, contact_generator, options)
+        elif db_type == 'stream':
+            from writers.StreamWriter import StreamWriter
+            return StreamWriter(number_of_contacts, contact_generator, options)
+        else:
+            raise ValueError("Invalid 'db_type' value. Must be 'csv', 'mysql', 'postgresql', 'parquet', 'arrow' or "
+                             "'stream'.")
+
+    @staticmethod
+    def prepare_checkpoint(db_type, number_of_contacts, db_config, options, generator_settings, resume):
+        """
+        Set up checkpointing of a database load and, with resume, continue from the saved state.
+
+        Checkpointed loads always have a seed, drawn at random if the configuration has none, so the rows of an
+        interrupted load can be regenerated exactly. On resume the seed is taken from the state file and the other
+        settings that determine the rows must be unchanged.
+
+        Args:
+            db_type (str): The type of the output.
+            number_of_contacts (int): The number of contacts for which data should be generated.
+            db_config (dict): A dictionary containing database connection parameters.
+            options (dict): The generation options loaded by ConfigLoader, 'checkpoint' is added to it.
+            generator_settings (dict): The settings of the ContactGenerator, 'seed' is set in it.
+            resume (bool): True if the interrupted load should be resumed.
+
+        Raises:
+            ConfigError: If resuming is not possible with the given output or configuration.
+        """
+        supported = db_type in ("postgresql", "mysql") and not db_config.get("async_mode") and not options["schema"]
+        if not supported or not options["checkpoint_file"]:
+            if resume:
+                raise ConfigError("--resume requires a postgresql or mysql output without async_mode or schema, "
+                                  "and a checkpoint_file.")
+            options["checkpoint"] = None
+            return
+
+        # The settings that determine the generated rows, recorded in the state file
+        settings = {"db_type": db_type, "number_of_contacts": number_of_contacts, "batch_size": options["batch_size"],
+                    **generator_settings}
+
+        checkpoint = Checkpoint(options["checkpoint_file"])
+        state = None
+        if resume:
+            state = checkpoint.load()
+            if settings["seed"] is None:
+                settings["seed"] = state["settings"].get("seed")
+            Checkpoint.check_settings(state, settings)
+        elif settings["seed"] is None:
+            settings["seed"] = random.SystemRandom().randrange(2 ** 32)
+
+        generator_settings["seed"] = settings["seed"]
+        options["checkpoint"] = {"file": options["checkpoint_file"], "settings": settings, "state": state}
+
+    def create_generator(self, generator_settings, workers):
+        """
+        Return a ContactGenerator, or a ShardedGenerator running one ContactGenerator per worker process.
+
+        A ContactGenerator built by an earlier job with the same Faker and value pool settings is reused with the
+        probabilities, unique fields and shard size of this one, skipping its warm-up. The worker processes of a
+        ShardedGenerator end with its job, so they are started anew.
+
+        Args:
+            generator_settings (dict): The keyword arguments of ContactGenerator, without 'faker'.
+            workers (int): The number of worker processes.
+
+        Returns:
+            ContactGenerator or ShardedGenerator: The generator of the contact data.
+        """
+        if workers > 1:
+            return ShardedGenerator(generator_settings, workers)
+
+        # Everything but the settings of with_options determines the warmed state of the generator
+        reused_settings = ("probabilities", "unique", "shard_size")
+        key = json.dumps({name: value for name, value in generator_settings.items() if name not in reused_settings},
+                         sort_keys=True, default=str)
+        if key not in self.generators:
+            self.generators[key] = ContactGenerator(ContactGenerator.create_faker(), **generator_settings)
+        return self.generators[key].with_options(generator_settings["probabilities"], generator_settings["unique"],
+                                                 generator_settings["shard_size"])
+
+    def write_schema(self, db_type, db_config, generator_settings, options):
+        """
+        Generate and write the tables of a relational schema, parents before their children.
+
+        Every table has an 'id' primary key and child tables a foreign key to their parent, which is indexed and, in
+        databases, constrained once the data is loaded. Each table gets its own seed derived from the configured one.
+        Indexes and unique indexes of the 'table' section are created on every table that has all of their columns.
+
+        Args:
+            db_type (str): The type of the output.
+            db_config (dict): A dictionary containing database connection parameters.
+            generator_settings (dict): The settings of the ContactGenerator shared by all tables.
+            options (dict): The generation options loaded by ConfigLoader, with the tables in 'schema'.
+
+        Returns:
+            None
+        """
+        table_options = options["table"] or {}
+        tables = {table["name"]: table for table in options["schema"]}
+        writers = {}
+
+        for table in options["schema"]:
+            # Values of the table, seeded per table so that the tables don't repeat each other's values
+            seed = generator_settings["seed"]
+            settings = dict(generator_settings, fields=table["fields"],
+                            seed=f"{seed}:{table['name']}" if seed is not None else None)
+            value_generator = self.create_generator(settings, options["workers"])
+
+            # Keys of the table, the foreign key references the table written by the parent's writer
+            parent, foreign_key = table["parent"], table["foreign_key"]
+            parent_rows = tables[parent]["rows"] if parent else None
+            table_generator = TableGenerator(value_generator, foreign_key, parent_rows, table["rows"],
+                                             table["distribution"], settings["seed"])
+
+            fields = set(table_generator.FIELDS)
+            foreign_key_index = [(foreign_key,)] if foreign_key else []
+            writer_options = dict(options, name=table["name"], checkpoint=None, table={
+                "primary_key": ("id",),
+                "indexes": foreign_key_index + [columns for columns in table_options.get("indexes", [])
+                                                if fields.issuperset(columns)],
+                "unique": [columns for columns in table_options.get("unique", []) if fields.issuperset(columns)],
+                "unlogged": table_options.get("unlogged", False),
+                "disable_checks": table_options.get("disable_checks", False),
+                "foreign_keys": {foreign_key: getattr(writers[parent], "table_name", parent)} if parent else {},
+            })
+
+            writer = self.writer_factory(db_type, table["rows"], db_config, table_generator, writer_options)
+            self._write(writer)
+            writers[table["name"]] = writer
+
+    def _write(self, writer):
+        """
+        Run a writer, reporting the time from process start to the first generated row with the first one.
+        """
+        if not self.started:
+            writer.metrics.set_value("startup_seconds", round(time.perf_counter() - self.start_time, 4))
+            self.started = True
+        writer.write()
@@ -0,0 +1,227 @@
+import cProfile
+import json
+import os
+import pstats
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class Metrics:
+    """
+    Class collecting timings and progress of a generation run.
+
+    Writers feed it automatically: every written batch is recorded with the time spent generating it, and the sink
+    stage is split into the time spent serializing rows and the time spent writing them. While the run is in
+    progress, rows/sec and ETA are printed to stderr; at the end a summary is printed and, if configured, dumped
+    as JSON or in the Prometheus text format. cProfile and tracemalloc capture can be switched on as well.
+    """
+
+    # Stages reported in the summary
+    STAGES = ("generate", "serialize", "write")
+
+    def __init__(self, total_rows, options=None):
+        """
+        Initialize Metrics with the expected number of rows and the 'metrics' options of the configuration.
+
+        Args:
+            total_rows (int): The number of rows the run will write, used for the ETA.
+            options (dict): The validated 'metrics' options. Missing keys fall back to the defaults: progress
+                            printed every 5 seconds, no metrics file, no profiling.
+        """
+        options = options or {}
+
+        self.total_rows = total_rows
+        self.progress = options.get("progress", True)
+        self.progress_interval = options.get("progress_interval", 5)
+        self.metrics_file = options.get("metrics_file")
+        self.metrics_format = options.get("metrics_format", "json")
+        self.profile_file = options.get("profile_file") if options.get("profile") else None
+
+        # The generator stage runs in another thread or process with a profiler of its own, merged by finish
+        self.generation_profile_file = f"{self.profile_file}.generate" if self.profile_file else None
+        self.trace_memory = options.get("tracemalloc", False)
+
+        self.stage_seconds = dict.fromkeys(self.STAGES + ("sink",), 0.0)
+        self.values = {}
+        self.rows = 0
+        self.batches = 0
+        self.start_time = None
+        self.last_report_time = None
+        self.profiler = None
+
+    def start(self):
+        """
+        Start the clock and the optional profilers.
+        """
+        self.start_time = self.last_report_time = time.perf_counter()
+        if self.trace_memory:
+            tracemalloc.start()
+        if self.profile_file:
+            # Don't merge the generator stage of an earlier run that failed before finish
+            if os.path.exists(self.generation_profile_file):
+                os.remove(self.generation_profile_file)
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def add(self, stage, seconds):
+        """
+        Add time spent in a stage.
+
+        Args:
+            stage (str): The name of the stage.
+            seconds (float): The time spent.
+        """
+        self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+
+    def set_value(self, name, value):
+        """
+        Record a named value that is reported with the metrics, e.g. the startup time.
+
+        Args:
+            name (str): The name of the value.
+            value (float): The value.
+        """
+        self.values[name] = value
+
+    @contextmanager
+    def timer(self, stage):
+        """
+        Context manager adding the time spent in its block to a stage.
+
+        Args:
+            stage (str): The name of the stage.
+        """
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start_time)
+
+    def record_batch(self, batch):
+        """
+        Record a written batch and print the progress if the progress interval has passed.
+
+        Args:
+            batch (ContactBatch): The written batch. Its generation_seconds, set by the pipeline, is added to
+                                  the 'generate' stage.
+        """
+        self.rows += len(batch)
+        self.batches += 1
+        self.add("generate", getattr(batch, "generation_seconds", 0.0))
+
+        now = time.perf_counter()
+        if self.progress and now - self.last_report_time >= self.progress_interval:
+            self.last_report_time = now
+            print(self._progress_line(now), file=sys.stderr)
+
+    def finish(self):
+        """
+        Stop the profilers, print the summary and dump the metrics file.
+
+        Returns:
+            dict: The collected metrics.
+        """
+        if self.profiler is not None:
+            self.profiler.disable()
+            stats = pstats.Stats(self.profiler)
+            if os.path.exists(self.generation_profile_file):
+                stats.add(self.generation_profile_file)
+                os.remove(self.generation_profile_file)
+            stats.dump_stats(self.profile_file)
+            print(f"Profile written to: {self.profile_file}", file=sys.stderr)
+
+        if self.trace_memory:
+            snapshot = tracemalloc.take_snapshot()
+            self.values["tracemalloc_peak_bytes"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print("Top memory allocations:", file=sys.stderr)
+            for statistic in snapshot.statistics("lineno")[:10]:
+                print(f"  {statistic}", file=sys.stderr)
+
+        metrics = self.to_dict()
+        if self.progress:
+            stages = ", ".join(f"{stage} {metrics['stage_seconds'][stage]:.2f} s" for stage in self.STAGES)
+            print(f"Wrote {self.rows} rows in {metrics['elapsed_seconds']:.2f} s "
+                  f"({metrics['rows_per_sec']:.0f} rows/sec; {stages})", file=sys.stderr)
+            if "startup_seconds" in metrics:
+                print(f"Startup took {metrics['startup_seconds']:.3f} s", file=sys.stderr)
+
+        if self.metrics_file:
+            with open(self.metrics_file, "w") as metrics_file:
+                if self.metrics_format == "prometheus":
+                    metrics_file.write(self.to_prometheus(metrics))
+                else:
+                    json.dump(metrics, metrics_file, indent=2)
+                    metrics_file.write("\n")
+        return metrics
+
+    def to_dict(self):
+        """
+        Return the collected metrics.
+
+        The 'write' stage is the time spent in the sink stage minus the part of it spent serializing.
+
+        Returns:
+            dict: The metrics as JSON-serializable values.
+        """
+        elapsed = time.perf_counter() - self.start_time if self.start_time is not None else 0.0
+        stage_seconds = dict(self.stage_seconds)
+        stage_seconds["write"] += max(0.0, stage_seconds.pop("sink") - stage_seconds["serialize"])
+
+        return {
+            "rows": self.rows,
+            "batches": self.batches,
+            "elapsed_seconds": round(elapsed, 4),
+            "rows_per_sec": round(self.rows / elapsed, 1) if elapsed else 0.0,
+            "stage_seconds": {stage: round(seconds, 4) for stage, seconds in stage_seconds.items()},
+            **self.values,
+        }
+
+    @staticmethod
+    def to_prometheus(metrics):
+        """
+        Format metrics in the Prometheus text exposition format.
+
+        Args:
+            metrics (dict): The metrics returned by to_dict.
+
+        Returns:
+            str: The metrics text.
+        """
+        lines = [
+            "# HELP contact_generator_rows_total Rows written.",
+            "# TYPE contact_generator_rows_total counter",
+            f"contact_generator_rows_total {metrics['rows']}",
+            "# HELP contact_generator_batches_total Batches written.",
+            "# TYPE contact_generator_batches_total counter",
+            f"contact_generator_batches_total {metrics['batches']}",
+            "# HELP contact_generator_elapsed_seconds Wall-clock time of the run.",
+            "# TYPE contact_generator_elapsed_seconds gauge",
+            f"contact_generator_elapsed_seconds {metrics['elapsed_seconds']}",
+            "# HELP contact_generator_rows_per_second Average throughput of the run.",
+            "# TYPE contact_generator_rows_per_second gauge",
+            f"contact_generator_rows_per_second {metrics['rows_per_sec']}",
+            "# HELP contact_generator_stage_seconds_total Time spent in each stage of the pipeline.",
+            "# TYPE contact_generator_stage_seconds_total counter",
+        ]
+        lines += [f'contact_generator_stage_seconds_total{{stage="{stage}"}} {seconds}'
+                  for stage, seconds in metrics["stage_seconds"].items()]
+
+        for name, value in metrics.items():
+            if name not in ("rows", "batches", "elapsed_seconds", "rows_per_sec", "stage_seconds"):
+                lines += [f"# TYPE contact_generator_{name} gauge", f"contact_generator_{name} {value}"]
+        return "\n".join(lines) + "\n"
+
+    def _progress_line(self, now):
+        """
+        Return the progress line with the rows written, throughput and ETA.
+        """
+        elapsed = now - self.start_time
+        rate = self.rows / elapsed if elapsed else 0.0
+        percent = self.rows / self.total_rows * 100 if self.total_rows else 100.0
+        eta = (self.total_rows - self.rows) / rate if rate else 0.0
+        minutes, seconds = divmod(int(eta), 60)
+        return (f"Progress: {self.rows}/{self.total_rows} rows ({percent:.1f}%), {rate:.0f} rows/sec, "
+                f"ETA {minutes}m{seconds:02d}s")
@@ -0,0 +1,174 @@
+import cProfile
+import multiprocessing
+import multiprocessing.queues
+import queue
+import threading
+import time
+import traceback
+
+
+class PipelineError(Exception):
+    """
+    Exception raised in the consumer when the generator stage of a Pipeline fails.
+    """
+    pass
+
+
+def _produce(contact_generator, number_of_rows, batch_size, start_row, batch_queue, stop_event, profile_file=None):
+    """
+    Generator stage of a Pipeline, run in a background thread or process.
+
+    Puts the generated batches into the queue, followed by None once all rows are generated. Every batch carries
+    the time spent generating it in generation_seconds. If the generation fails, a PipelineError with the formatted
+    traceback is put into the queue instead. With a profile_file, the stage is profiled with its own cProfile
+    profiler, as profilers only see the thread they are enabled in, and the stats are dumped to that file.
+    """
+    profiler = None
+    if profile_file:
+        try:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        except ValueError:
+            # Another profiler is active and already covers this thread
+            profiler = None
+
+    try:
+        _produce_batches(contact_generator, number_of_rows, batch_size, start_row, batch_queue, stop_event)
+    finally:
+        # The consumer joins the stage before reading the profile
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(profile_file)
+
+
+def _produce_batches(contact_generator, number_of_rows, batch_size, start_row, batch_queue, stop_event):
+    """
+    Generate the batches of _produce and put them into the queue.
+    """
+    try:
+        batches = contact_generator.iter_batches(number_of_rows, batch_size, start_row)
+        while True:
+            # Generate the next batch and record how long it took
+            start_time = time.perf_counter()
+            batch = next(batches, None)
+            if batch is None:
+                break
+            batch.generation_seconds = time.perf_counter() - start_time
+
+            # Wait for free space in the queue, unless the consumer has stopped
+            while not stop_event.is_set():
+                try:
+                    batch_queue.put(batch, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+            if stop_event.is_set():
+                # Don't wait for unread batches to be flushed when a process exits
+                if isinstance(batch_queue, multiprocessing.queues.Queue):
+                    batch_queue.cancel_join_thread()
+                return
+        batch_queue.put(None)
+    except Exception:
+        batch_queue.put(PipelineError(f"Data generation failed:\n{traceback.format_exc()}"))
+
+
+class Pipeline:
+    """
+    Class running data generation in a background stage that feeds a bounded queue of batches.
+
+    Iterating over a Pipeline yields the generated batches while the next ones are already being generated.
+    Because the queue is bounded, the generator blocks when the consumer falls behind, so memory use is limited to
+    queue_depth batches.
+    """
+
+    # Supported backends of the generator stage
+    BACKENDS = ("thread", "process")
+
+    def __init__(self, contact_generator, number_of_rows, batch_size, queue_depth=4, backend="thread", start_row=0,
+                 profile_file=None):
+        """
+        Initialize Pipeline with the generator and the sizes of its stages.
+
+        Args:
+            contact_generator (ContactGenerator): The generator producing the batches. With the 'process' backend
+                                                  it is pickled into the background process.
+            number_of_rows (int): The total number of rows to generate.
+            batch_size (int): The maximum number of rows in a single batch.
+            queue_depth (int): The maximum number of generated batches waiting for the consumer.
+            backend (str): 'thread' to generate in a background thread, or 'process' to generate in a background
+                           process, which also takes generation off the consumer's GIL.
+            start_row (int): The index of the first row to generate, to continue an interrupted run.
+            profile_file (str): The file the cProfile stats of the generator stage are dumped to, None to not
+                                profile it.
+        """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Invalid backend '{backend}'. Must be one of: {', '.join(self.BACKENDS)}.")
+
+        self.contact_generator = contact_generator
+        self.number_of_rows = number_of_rows
+        self.batch_size = batch_size
+        self.queue_depth = queue_depth
+        self.backend = backend
+        self.start_row = start_row
+        self.profile_file = profile_file
+
+    def __iter__(self):
+        if self.backend == "process":
+            batch_queue = multiprocessing.Queue(self.queue_depth)
+            stop_event = multiprocessing.Event()
+            worker_class = multiprocessing.Process
+        else:
+            batch_queue = queue.Queue(self.queue_depth)
+            stop_event = threading.Event()
+            worker_class = threading.Thread
+
+        # The process is not a daemon so that it may start worker processes of its own (ShardedGenerator)
+        producer = worker_class(target=_produce, daemon=self.backend == "thread",
+                                args=(self.contact_generator, self.number_of_rows, self.batch_size, self.start_row,
+                                      batch_queue, stop_event, self.profile_file))
+        producer.start()
+
+        try:
+            while True:
+                batch = self._next_batch(batch_queue, producer)
+                if batch is None:
+                    break
+                if isinstance(batch, PipelineError):
+                    raise batch
+                yield batch
+        finally:
+            # Unblock and stop the generator stage, also when the consumer stopped early
+            stop_event.set()
+            self._drain(batch_queue)
+            producer.join(timeout=5)
+            if self.backend == "process" and producer.is_alive():
+                producer.terminate()
+
+    @staticmethod
+    def _next_batch(batch_queue, producer):
+        """
+        Wait for the next item of the queue, failing if the generator stage died without finishing.
+        """
+        while True:
+            try:
+                return batch_queue.get(timeout=1)
+            except queue.Empty:
+                if producer.is_alive():
+                    continue
+
+            # The producer may have put its last item right before exiting
+            try:
+                return batch_queue.get(timeout=1)
+            except queue.Empty:
+                raise PipelineError("Data generation stopped unexpectedly.")
+
+    @staticmethod
+    def _drain(batch_queue):
+        """
+        Remove all waiting batches from the queue.
+        """
+        try:
+            while True:
+                batch_queue.get_nowait()
+        except queue.Empty:
+            pass
@@ -0,0 +1,78 @@
+import csv
+import io
+import json
+from json.encoder import encode_basestring
+
+
+class RowFormatter:
+    """
+    Class for serializing whole batches of contact data into text formats understood by bulk loaders.
+    """
+
+    # Representation of NULL in PostgreSQL COPY text format
+    COPY_NULL = "\\N"
+
+    # Characters that must be escaped in PostgreSQL COPY text format
+    COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+    @classmethod
+    def to_copy_text(cls, batch):
+        """
+        Serialize a batch into PostgreSQL COPY text format.
+
+        Values are escaped column by column and the rows are then joined in one pass, so no per-row Python objects
+        other than the output lines are created.
+
+        Args:
+            batch (ContactBatch): The batch to serialize.
+
+        Returns:
+            str: Tab separated lines, one per row, each terminated by a newline.
+        """
+        escapes, null = cls.COPY_ESCAPES, cls.COPY_NULL
+        columns = [[null if value is None else str(value).translate(escapes) for value in column]
+                   for column in batch.columns.values()]
+
+        if not batch.size:
+            return ""
+        return "\n".join(map("\t".join, zip(*columns))) + "\n"
+
+    @staticmethod
+    def to_csv(batch, delimiter=";"):
+        """
+        Serialize a batch into delimiter separated lines, quoted where needed, with NULL as an empty value.
+
+        Args:
+            batch (ContactBatch): The batch to serialize.
+            delimiter (str): The field delimiter, e.g. ';' or a tab.
+
+        Returns:
+            str: The lines, one per row.
+        """
+        buffer = io.StringIO()
+        csv.writer(buffer, delimiter=delimiter, lineterminator="\n").writerows(batch.rows())
+        return buffer.getvalue()
+
+    @staticmethod
+    def to_ndjson(batch):
+        """
+        Serialize a batch into newline delimited JSON, one object per row with null for missing values.
+
+        The "key":value members are encoded column by column with the C string encoder of the json module, so
+        no dictionary is built per row.
+
+        Args:
+            batch (ContactBatch): The batch to serialize.
+
+        Returns:
+            str: The JSON lines, one per row, each terminated by a newline.
+        """
+        columns = []
+        for field, column in batch.columns.items():
+            key = encode_basestring(field) + ":"
+            columns.append([key + ("null" if value is None else encode_basestring(value) if type(value) is str
+                                   else json.dumps(value)) for value in column])
+
+        if not batch.size:
+            return ""
+        return "\n".join("{" + ",".join(members) + "}" for members in zip(*columns)) + "\n"
@@ -0,0 +1,100 @@
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.ContactGenerator import ContactGenerator
+
+# ContactGenerator of the current worker process, built once by _init_worker
+_worker_generator = None
+
+
+def _init_worker(settings):
+    """
+    Build the ContactGenerator of a worker process, with its own random state if there is no seed.
+
+    Args:
+        settings (dict): The settings passed to ContactGenerator.from_settings.
+    """
+    global _worker_generator
+    _worker_generator = ContactGenerator.from_settings(settings)
+
+    # Forked workers inherit the random state of the parent, without a seed they would all generate the same rows
+    if settings.get("seed") is None:
+        _worker_generator.reseed(random.SystemRandom().getrandbits(64))
+
+
+def _generate_shard(shard_index, number_of_rows, batch_size):
+    """
+    Generate one shard in a worker process.
+
+    Returns:
+        list: The ContactBatch objects of the shard.
+    """
+    return list(_worker_generator.generate_shard(shard_index, number_of_rows, batch_size))
+
+
+class ShardedGenerator:
+    """
+    Class for generating contact data on several CPU cores.
+
+    The rows are split into shards of a fixed size that are generated by a pool of worker processes, each with its
+    own ContactGenerator. Because every shard is seeded from its index, the output is the same for any number of
+    workers, though not for other shard or batch sizes. Shards are returned in order and only a bounded number of
+    them is in flight at any time, so memory use does not grow with the number of rows.
+    """
+
+    # Same default fields and order as ContactGenerator
+    FIELDS = ContactGenerator.FIELDS
+
+    def __init__(self, settings, workers, max_pending_shards=None):
+        """
+        Initialize ShardedGenerator with the generator settings and the number of worker processes.
+
+        Args:
+            settings (dict): The settings passed to ContactGenerator.from_settings in every worker.
+            workers (int): The number of worker processes.
+            max_pending_shards (int): The maximum number of shards submitted but not yet consumed.
+                                      Defaults to twice the number of workers.
+        """
+        self.settings = settings
+        if settings.get("fields"):
+            self.FIELDS = tuple(settings["fields"])
+        self.workers = workers
+        self.shard_size = settings.get("shard_size", 20000)
+        self.max_pending_shards = max_pending_shards or 2 * workers
+
+    def iter_batches(self, number_of_rows, batch_size, start_row=0):
+        """
+        Generate contact data for the given number of rows as a sequence of batches.
+
+        Args:
+            number_of_rows (int): The total number of rows to generate.
+            batch_size (int): The maximum number of rows in a single batch.
+            start_row (int): The index of the first row to return.
+
+        Yields:
+            ContactBatch: The generated batches, in the same order as ContactGenerator.iter_batches.
+        """
+        first_shard = start_row // self.shard_size
+        shards = ContactGenerator.split_into_shards(number_of_rows, self.shard_size)[first_shard:]
+        skipped_rows = start_row - first_shard * self.shard_size
+
+        with ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(self.settings,)) as executor:
+            pending = deque()
+
+            def next_shard():
+                # Drop the rows before start_row from the first shard
+                nonlocal skipped_rows
+                batches = ContactGenerator.skip_rows(pending.popleft().result(), skipped_rows)
+                skipped_rows = 0
+                return batches
+
+            for shard_index, shard_rows in shards:
+                pending.append(executor.submit(_generate_shard, shard_index, shard_rows, batch_size))
+
+                # Wait for the oldest shard once the queue is full
+                if len(pending) >= self.max_pending_shards:
+                    yield from next_shard()
+
+            while pending:
+                yield from next_shard()
@@ -0,0 +1,103 @@
+import random
+
+from utils.ContactBatch import ContactBatch
+
+
+class TableGenerator:
+    """
+    Class for generating the rows of one table of a relational schema.
+
+    The values come from a ContactGenerator or ShardedGenerator, to which an 'id' primary key and, for child tables,
+    a foreign key to the parent table are added. Keys are dense integers from 1 to the number of rows, so the key of
+    every parent row is known from the number of parent rows alone and no parent keys have to be kept in memory or
+    read back from the database. Every foreign key is computed from the row index only, so batches can be generated
+    in any order, in any process, and resumed at any row.
+    """
+
+    # Supported distributions of the child rows over the parent rows
+    DISTRIBUTIONS = ("even", "random")
+
+    # Mask of the 64 bit arithmetic of _mix
+    MASK = (1 << 64) - 1
+
+    def __init__(self, value_generator, foreign_key=None, parent_rows=None, number_of_rows=None,
+                 distribution="even", seed=None):
+        """
+        Initialize TableGenerator with the value generator and the foreign key of the table.
+
+        Args:
+            value_generator (ContactGenerator): The generator of the value columns, or a ShardedGenerator.
+            foreign_key (str): The name of the foreign key column, or None for a root table.
+            parent_rows (int): The number of rows of the parent table.
+            number_of_rows (int): The number of rows of this table.
+            distribution (str): 'even' to give every parent the same number of children, stored next to each other,
+                                or 'random' to pick the parent of every row at random.
+            seed: The seed of the random distribution.
+        """
+        if distribution not in self.DISTRIBUTIONS:
+            raise ValueError(f"Invalid distribution '{distribution}'. "
+                             f"Must be one of: {', '.join(self.DISTRIBUTIONS)}.")
+
+        self.value_generator = value_generator
+        self.foreign_key = foreign_key
+        self.parent_rows = parent_rows
+        self.number_of_rows = number_of_rows
+        self.distribution = distribution
+        self.seed_key = random.Random(seed).getrandbits(64)
+
+        # The key columns come before the value columns
+        key_fields = ("id", foreign_key) if foreign_key else ("id",)
+        self.FIELDS = key_fields + tuple(value_generator.FIELDS)
+
+    def iter_batches(self, number_of_rows, batch_size, start_row=0):
+        """
+        Generate the rows of the table as a sequence of batches.
+
+        Args:
+            number_of_rows (int): The total number of rows to generate.
+            batch_size (int): The maximum number of rows in a single batch.
+            start_row (int): The index of the first row to return.
+
+        Yields:
+            ContactBatch: The batches with the key columns followed by the value columns.
+        """
+        row = start_row
+        for batch in self.value_generator.iter_batches(number_of_rows, batch_size, start_row):
+            rows = range(row, row + len(batch))
+            columns = {"id": [index + 1 for index in rows]}
+            if self.foreign_key:
+                columns[self.foreign_key] = self.parent_keys(rows)
+            columns.update(batch.columns)
+
+            keyed_batch = ContactBatch(columns, len(batch))
+            keyed_batch.generation_seconds = batch.generation_seconds
+            yield keyed_batch
+            row += len(batch)
+
+    def parent_keys(self, rows):
+        """
+        Return the parent key of each of the given rows.
+
+        Args:
+            rows (range): The indexes of the rows.
+
+        Returns:
+            list: The keys of the parent rows, between 1 and parent_rows.
+        """
+        parent_rows, number_of_rows = self.parent_rows, self.number_of_rows
+        if self.distribution == "even":
+            return [row * parent_rows // number_of_rows + 1 for row in rows]
+
+        # Hash the row index with the seed, so every row always gets the same parent
+        mix, seed_key = self._mix, self.seed_key
+        return [mix(row ^ seed_key) % parent_rows + 1 for row in rows]
+
+    @classmethod
+    def _mix(cls, value):
+        """
+        Scramble a 64 bit integer with the splitmix64 finalizer.
+        """
+        value = (value + 0x9E3779B97F4A7C15) & cls.MASK
+        value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & cls.MASK
+        value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & cls.MASK
+        return value ^ (value >> 31)
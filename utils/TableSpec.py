@@ -0,0 +1,178 @@
+class TableSpec:
+    """
+    Class describing the database table the contact data is loaded into.
+
+    The table is created without keys, indexes and foreign keys; these are added by the statements returned from
+    post_load_queries once the data is loaded, which is much faster than maintaining them during the load.
+    """
+
+    # Column types matching the truncation lengths applied by ContactGenerator
+    COLUMN_TYPES = {
+        "id": "BIGINT",
+        "first_name": "VARCHAR(20)",
+        "last_name": "VARCHAR(20)",
+        "date_of_birth": "DATE",
+        "email": "VARCHAR(255)",
+        "phone": "VARCHAR(10)",
+        "street_address_1": "VARCHAR(40)",
+        "street_address_2": "VARCHAR(40)",
+        "city": "VARCHAR(40)",
+        "state_province": "VARCHAR(20)",
+        "postal_code": "VARCHAR(10)",
+        "country": "VARCHAR(40)",
+        "company": "VARCHAR(40)",
+        "phone_type": "VARCHAR(10)",
+    }
+
+    # Name of the surrogate key column added when primary_key is 'id' and the data has no 'id' column
+    SURROGATE_KEY = "id"
+
+    def __init__(self, fields, primary_key=None, indexes=(), unique=(), unlogged=False, disable_checks=False,
+                 foreign_keys=None):
+        """
+        Initialize TableSpec with the columns of the table and the keys created after the load.
+
+        Args:
+            fields (tuple): The names of the data columns, in load order.
+            primary_key (tuple): The columns of the primary key. ('id',) adds a generated surrogate key, unless the
+                                 data has an 'id' column already.
+            indexes (list): Column tuples, one per non-unique index.
+            unique (list): Column tuples, one per unique index.
+            unlogged (bool): PostgreSQL only. Create the table UNLOGGED and switch it to LOGGED after the load.
+            disable_checks (bool): MySQL only. Disable unique and foreign key checks during the load. The table has no
+                                   keys while loading, so ALTER TABLE ... DISABLE KEYS, which only affects MyISAM,
+                                   is not needed.
+            foreign_keys (dict): Maps BIGINT columns to the name of the table whose 'id' they reference.
+        """
+        self.fields = fields
+        self.primary_key = primary_key
+        self.indexes = list(indexes)
+        self.unique = list(unique)
+        self.unlogged = unlogged
+        self.disable_checks = disable_checks
+        self.foreign_keys = foreign_keys or {}
+
+    @classmethod
+    def from_options(cls, fields, options):
+        """
+        Create a TableSpec from the validated 'table' options of the configuration file.
+
+        Args:
+            fields (tuple): The names of the data columns, in load order.
+            options (dict): The table options, or None for a plain table.
+
+        Returns:
+            TableSpec: The table specification.
+        """
+        return cls(fields, **(options or {}))
+
+    def create_table_query(self, table_name, dialect):
+        """
+        Return the CREATE TABLE statement of the table, without keys and indexes.
+
+        Args:
+            table_name (str): The name of the table.
+            dialect (str): Either 'postgresql' or 'mysql'.
+
+        Returns:
+            str: The CREATE TABLE statement.
+        """
+        columns = ",\n".join(f"    {field} {self.column_type(field)}" for field in self.fields)
+        unlogged = "UNLOGGED " if self.unlogged and dialect == "postgresql" else ""
+        return f"CREATE {unlogged}TABLE {table_name} (\n{columns}\n)"
+
+    def column_type(self, field):
+        """
+        Return the SQL type of a column.
+
+        Args:
+            field (str): The name of the column.
+
+        Returns:
+            str: The SQL type, VARCHAR(255) for columns of unknown length.
+        """
+        if field in self.foreign_keys:
+            return "BIGINT"
+        return self.COLUMN_TYPES.get(field, "VARCHAR(255)")
+
+    def pre_load_queries(self, table_name, dialect):
+        """
+        Return the statements run right before the data is loaded.
+
+        Args:
+            table_name (str): The name of the table.
+            dialect (str): Either 'postgresql' or 'mysql'.
+
+        Returns:
+            list: The statements, possibly empty.
+        """
+        if dialect == "mysql" and self.disable_checks:
+            return [self.session_settings_query(dialect)]
+        return []
+
+    def session_settings_query(self, dialect):
+        """
+        Return the statement applying the load-time session settings, which every loading connection must run.
+
+        Args:
+            dialect (str): Either 'postgresql' or 'mysql'.
+
+        Returns:
+            str: The SET statement, or None if the load needs no session settings.
+        """
+        if dialect == "mysql" and self.disable_checks:
+            return "SET unique_checks = 0, foreign_key_checks = 0"
+        return None
+
+    def post_load_queries(self, table_name, dialect):
+        """
+        Return the statements run after the data is loaded, adding keys and indexes and restoring load-time settings.
+
+        Args:
+            table_name (str): The name of the table.
+            dialect (str): Either 'postgresql' or 'mysql'.
+
+        Returns:
+            list: The statements, possibly empty.
+        """
+        queries = []
+        add_surrogate_key = self.primary_key == (self.SURROGATE_KEY,) and self.SURROGATE_KEY not in self.fields
+        foreign_keys = [(f"{table_name}_fk{number}", column, parent_table)
+                        for number, (column, parent_table) in enumerate(self.foreign_keys.items(), 1)]
+
+        if dialect == "mysql":
+            if self.disable_checks:
+                queries.append("SET unique_checks = 1, foreign_key_checks = 1")
+
+            # MySQL builds all keys of a single ALTER TABLE in one pass over the table
+            clauses = []
+            if add_surrogate_key:
+                clauses.append(f"ADD COLUMN {self.SURROGATE_KEY} BIGINT NOT NULL AUTO_INCREMENT PRIMARY KEY FIRST")
+            elif self.primary_key:
+                clauses.append(f"ADD PRIMARY KEY ({', '.join(self.primary_key)})")
+            clauses += [f"ADD UNIQUE INDEX {table_name}_uniq{number} ({', '.join(columns)})"
+                        for number, columns in enumerate(self.unique, 1)]
+            clauses += [f"ADD INDEX {table_name}_idx{number} ({', '.join(columns)})"
+                        for number, columns in enumerate(self.indexes, 1)]
+            clauses += [f"ADD CONSTRAINT {name} FOREIGN KEY ({column}) REFERENCES {parent_table} ({self.SURROGATE_KEY})"
+                        for name, column, parent_table in foreign_keys]
+            if clauses:
+                queries.append(f"ALTER TABLE {table_name} " + ", ".join(clauses))
+            return queries
+
+        if add_surrogate_key:
+            queries.append(f"ALTER TABLE {table_name} ADD COLUMN {self.SURROGATE_KEY} BIGINT "
+                           f"GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY")
+        elif self.primary_key:
+            queries.append(f"ALTER TABLE {table_name} ADD PRIMARY KEY ({', '.join(self.primary_key)})")
+        queries += [f"CREATE UNIQUE INDEX {table_name}_uniq{number} ON {table_name} ({', '.join(columns)})"
+                    for number, columns in enumerate(self.unique, 1)]
+        queries += [f"CREATE INDEX {table_name}_idx{number} ON {table_name} ({', '.join(columns)})"
+                    for number, columns in enumerate(self.indexes, 1)]
+        queries += [f"ALTER TABLE {table_name} ADD CONSTRAINT {name} FOREIGN KEY ({column}) "
+                    f"REFERENCES {parent_table} ({self.SURROGATE_KEY})" for name, column, parent_table in foreign_keys]
+
+        # Indexes are built while the table is still unlogged, then written to the WAL together with the data
+        if self.unlogged:
+            queries.append(f"ALTER TABLE {table_name} SET LOGGED")
+        return queries
@@ -0,0 +1,73 @@
+from array import array
+
+
+class ValuePool:
+    """
+    Class representing a deduplicated table of strings stored in a compact array-backed form.
+
+    All values are concatenated into one string and located by an array of offsets, so a pool of tens of
+    thousands of values costs one string object plus a few bytes per value instead of one object per value.
+    """
+
+    def __init__(self, values, max_length=None):
+        """
+        Initialize ValuePool with the given values.
+
+        Args:
+            values (iterable): The string values of the pool. Duplicates are removed, first occurrence wins.
+            max_length (int): If given, every value is truncated to this length before deduplication.
+        """
+        if max_length is not None:
+            values = (value[:max_length] for value in values)
+        unique_values = list(dict.fromkeys(values))
+
+        if not unique_values:
+            raise ValueError("A value pool needs at least one value.")
+
+        offsets = array("L", [0])
+        position = 0
+        for value in unique_values:
+            position += len(value)
+            offsets.append(position)
+
+        self._blob = "".join(unique_values)
+        self._offsets = offsets
+
+    @classmethod
+    def from_callable(cls, function, pool_size, max_length=None):
+        """
+        Build a pool by calling a value-producing function a number of times.
+
+        Args:
+            function (callable): A function without arguments returning one string value, e.g. faker.city.
+            pool_size (int): The number of times the function is called.
+            max_length (int): If given, every value is truncated to this length.
+
+        Returns:
+            ValuePool: The pool of distinct values returned by the function.
+        """
+        return cls((function() for _ in range(pool_size)), max_length)
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        return self._blob[self._offsets[index]:self._offsets[index + 1]]
+
+    def sample(self, k, random_generator):
+        """
+        Draw k values from the pool uniformly, with replacement.
+
+        Args:
+            k (int): The number of values to draw.
+            random_generator (random.Random): The source of randomness.
+
+        Returns:
+            list: The drawn values.
+        """
+        blob, offsets, size, draw = self._blob, self._offsets, len(self), random_generator.random
+        values = []
+        for _ in range(k):
+            index = int(draw() * size)
+            values.append(blob[offsets[index]:offsets[index + 1]])
+        return values
@@ -0,0 +1,18 @@
+import pyarrow as pa
+from .ColumnarWriter import ColumnarWriter
+
+
+class ArrowWriter(ColumnarWriter):
+    """
+    Class for generating contact data and writing it to an Arrow IPC file, one record batch per batch.
+    """
+
+    extension = ".arrow"
+    format_name = "Arrow"
+
+    def open_file(self, path):
+        compression = None if self.compression == "none" else self.compression
+        return pa.ipc.new_file(path, self.schema, options=pa.ipc.IpcWriteOptions(compression=compression))
+
+    def write_record_batch(self, record_batch):
+        self.file_writer.write_batch(record_batch)
@@ -0,0 +1,169 @@
+import asyncio
+import time
+from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from .BaseWriter import BaseWriter
+
+
+class AsyncBaseWriter(BaseWriter):
+    """
+    Abstract Base Class representing an asyncio-based database writer with a connection pool.
+
+    Batches come from the generator stage of the pipeline while up to max_inflight_chunks batches are loaded
+    concurrently over a pool of pool_size connections, each connection loading a disjoint batch into the target table.
+    The sink time in the metrics is summed over the concurrent loads, so it may exceed the elapsed time.
+    """
+
+    def write(self):
+        """
+        Write generated contact data to the database.
+
+        Returns:
+            None
+        """
+        # Pools kept between jobs are bound to the event loop of the connection cache
+        if self.connection_cache is not None:
+            self.connection_cache.run(self._write_async())
+        else:
+            asyncio.run(self._write_async())
+
+    async def _write_async(self):
+        """
+        Prepare the target table, load all batches concurrently, then finish the table.
+        """
+        pool_size = self.db_config.get("pool_size", 4)
+        max_inflight_chunks = self.db_config.get("max_inflight_chunks", 2 * pool_size)
+
+        self.metrics.start()
+        table_name = self.table_name = await self.prepare_table()
+        pool = await self._open_pool(pool_size)
+
+        start_time = time.perf_counter()
+        rows = 0
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(max_inflight_chunks)
+        tasks = set()
+        errors = []
+        loaded = False
+
+        def on_loaded(task):
+            slots.release()
+            tasks.discard(task)
+            if not task.cancelled() and task.exception() is not None:
+                errors.append(task.exception())
+
+        try:
+            batches = iter(self.generate_batches())
+            with ThreadPoolExecutor(1) as generation_executor:
+                while not errors:
+                    # Wait for the next batch without blocking the event loop while the pool loads the previous ones
+                    batch = await loop.run_in_executor(generation_executor, next, batches, None)
+                    if batch is None:
+                        break
+
+                    await slots.acquire()
+                    task = asyncio.create_task(self._load_and_record(pool, table_name, batch))
+                    tasks.add(task)
+                    task.add_done_callback(on_loaded)
+                    rows += len(batch)
+
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+            # Stop instead of finishing the table if a batch failed to load
+            if errors:
+                raise errors[0]
+            loaded = True
+        finally:
+            for task in list(tasks):
+                task.cancel()
+            await self._release_pool(pool, discard=not loaded)
+
+        elapsed = time.perf_counter() - start_time
+        await self.finish_table(table_name)
+
+        # Print a success message with table name and throughput
+        print(f"Data inserted successfully into table: {table_name}")
+        print(f"Loaded {rows} rows in {elapsed:.2f} s ({rows / elapsed if elapsed else 0:.0f} rows/sec, "
+              f"pool_size={pool_size}, max_inflight_chunks={max_inflight_chunks})")
+        self.metrics.finish()
+
+    async def _open_pool(self, pool_size):
+        """
+        Create the connection pool, or take the pool of a previous job from the connection cache.
+        """
+        if self.connection_cache is None:
+            return await self.create_pool(pool_size)
+        return await self.connection_cache.get_pool(self.connection_key(), lambda: self.create_pool(pool_size),
+                                                    self.close_pool)
+
+    async def _release_pool(self, pool, discard):
+        """
+        Close the connection pool, unless it is kept in the connection cache. A pool whose load failed is discarded.
+        """
+        if self.connection_cache is None:
+            await self.close_pool(pool)
+        elif discard:
+            await self.connection_cache.discard_pool(self.connection_key())
+
+    async def _load_and_record(self, pool, table_name, batch):
+        """
+        Load one batch with load_batch and record it in the metrics.
+        """
+        with self.metrics.timer("sink"):
+            await self.load_batch(pool, table_name, batch)
+        self.metrics.record_batch(batch)
+
+    @abstractmethod
+    async def prepare_table(self):
+        """
+        Create the database if needed and the target table.
+
+        Returns:
+            str: The name of the created table.
+        """
+        pass
+
+    @abstractmethod
+    async def create_pool(self, pool_size):
+        """
+        Create the connection pool used to load the batches.
+
+        Args:
+            pool_size (int): The number of connections in the pool.
+
+        Returns:
+            The connection pool.
+        """
+        pass
+
+    @abstractmethod
+    async def load_batch(self, pool, table_name, batch):
+        """
+        Load and commit one batch on a connection of the pool.
+
+        Args:
+            pool: The connection pool.
+            table_name (str): The name of the target table.
+            batch (ContactBatch): The batch to load.
+        """
+        pass
+
+    @abstractmethod
+    async def close_pool(self, pool):
+        """
+        Close the connection pool.
+
+        Args:
+            pool: The connection pool.
+        """
+        pass
+
+    @abstractmethod
+    async def finish_table(self, table_name):
+        """
+        Create keys and indexes and restore load-time settings once all data is loaded.
+
+        Args:
+            table_name (str): The name of the target table.
+        """
+        pass
@@ -0,0 +1,86 @@
+import aiomysql
+from datetime import datetime
+from .AsyncBaseWriter import AsyncBaseWriter
+from .BaseWriter import DatabaseConnectionError
+
+
+class AsyncMySQLWriter(AsyncBaseWriter):
+    """
+    Class for writing contact data to a MySQL database over a pool of aiomysql connections.
+    """
+
+    async def prepare_table(self):
+        """
+        Create the target database if it doesn't exist and a new table with a unique timestamp in the name.
+
+        Returns:
+            str: The name of the created table.
+        """
+        connect_config = self._aiomysql_config()
+        database_name = connect_config.pop("db")
+
+        # Connect to MySQL without specifying the database
+        try:
+            connection = await aiomysql.connect(**connect_config)
+        except (OSError, aiomysql.Error) as e:
+            raise DatabaseConnectionError(f"Unable to establish a connection to the MySQL server. Please verify your "
+                                          f"connection parameters.\nError details: {e}") from e
+
+        # Create table with dynamic name
+        timestamp = datetime.now().strftime("%Y_%m_%dT%H_%M_%S")
+        table_name = f"{self.name}_{timestamp}"
+
+        async with connection.cursor() as cursor:
+            await cursor.execute(f"CREATE DATABASE IF NOT EXISTS {database_name}")
+            await cursor.execute(f"USE {database_name}")
+            await cursor.execute(self.table_spec.create_table_query(table_name, "mysql"))
+            for query in self.table_spec.pre_load_queries(table_name, "mysql"):
+                await cursor.execute(query)
+        connection.close()
+
+        return table_name
+
+    async def create_pool(self, pool_size):
+        # Session settings of the load are applied to every pooled connection
+        return await aiomysql.create_pool(**self._aiomysql_config(), minsize=pool_size, maxsize=pool_size,
+                                          init_command=self.table_spec.session_settings_query("mysql"))
+
+    def connection_key(self):
+        # Pooled connections run the session settings of the table spec, so only loads with the same ones share a pool
+        return super().connection_key() + (self.table_spec.session_settings_query("mysql"),)
+
+    async def load_batch(self, pool, table_name, batch):
+        """
+        Insert one batch with a multi-row INSERT and commit it.
+        """
+        insert_query = (f"INSERT INTO {table_name} ({', '.join(batch.fields)}) "
+                        f"VALUES ({', '.join(['%s'] * len(batch.fields))})")
+        async with pool.acquire() as connection:
+            async with connection.cursor() as cursor:
+                with self.metrics.timer("serialize"):
+                    rows = list(batch.rows())
+                await cursor.executemany(insert_query, rows)
+            await connection.commit()
+
+    async def close_pool(self, pool):
+        pool.close()
+        await pool.wait_closed()
+
+    async def finish_table(self, table_name):
+        connection = await aiomysql.connect(**self._aiomysql_config())
+        async with connection.cursor() as cursor:
+            for query in self.table_spec.post_load_queries(table_name, "mysql"):
+                await cursor.execute(query)
+        connection.close()
+
+    def _aiomysql_config(self):
+        """
+        Return the connection parameters in the form expected by aiomysql.
+
+        Returns:
+            dict: The connection parameters with 'database' renamed to 'db' and the port converted to an integer.
+        """
+        connect_config = self.connection_config()
+        connect_config["db"] = connect_config.pop("database")
+        connect_config["port"] = int(connect_config["port"])
+        return connect_config
@@ -0,0 +1,78 @@
+import io
+import asyncpg
+from datetime import datetime
+from .AsyncBaseWriter import AsyncBaseWriter
+from .BaseWriter import DatabaseConnectionError
+from utils.RowFormatter import RowFormatter
+
+
+class AsyncPostgreSQLWriter(AsyncBaseWriter):
+    """
+    Class for writing contact data to a PostgreSQL database over a pool of asyncpg connections.
+    """
+
+    async def prepare_table(self):
+        """
+        Create the target database if it doesn't exist and a new table with a unique timestamp in the name.
+
+        Returns:
+            str: The name of the created table.
+        """
+        # Connect to the default 'postgres' database
+        try:
+            default_db_config = self._asyncpg_config()
+            default_db_config["database"] = "postgres"
+
+            connection = await asyncpg.connect(**default_db_config)
+        except (OSError, asyncpg.PostgresError) as e:
+            raise DatabaseConnectionError(f"Unable to establish a connection to the PostgreSQL server. Please verify "
+                                          f"connection parameters.\nError details: {e}") from e
+
+        # Check if the target database exists and create it if it doesn't
+        target_database = self.db_config["database"]
+        exists = await connection.fetchval("SELECT 1 FROM pg_database WHERE datname = $1", target_database)
+        if not exists:
+            await connection.execute(f"CREATE DATABASE {target_database}")
+        await connection.close()
+
+        # Create table with dynamic name
+        timestamp = datetime.now().strftime("%Y_%m_%dT%H_%M_%S")
+        table_name = f"{self.name}_{timestamp}"
+
+        connection = await asyncpg.connect(**self._asyncpg_config())
+        await connection.execute(self.table_spec.create_table_query(table_name, "postgresql"))
+        await connection.close()
+
+        return table_name
+
+    async def create_pool(self, pool_size):
+        return await asyncpg.create_pool(**self._asyncpg_config(), min_size=pool_size, max_size=pool_size)
+
+    async def load_batch(self, pool, table_name, batch):
+        """
+        Stream one batch into the table with COPY ... FROM STDIN in text format.
+        """
+        with self.metrics.timer("serialize"):
+            buffer = io.BytesIO(RowFormatter.to_copy_text(batch).encode("utf-8"))
+        async with pool.acquire() as connection:
+            await connection.copy_to_table(table_name, source=buffer, columns=list(batch.fields), format="text")
+
+    async def close_pool(self, pool):
+        await pool.close()
+
+    async def finish_table(self, table_name):
+        connection = await asyncpg.connect(**self._asyncpg_config())
+        for query in self.table_spec.post_load_queries(table_name, "postgresql"):
+            await connection.execute(query)
+        await connection.close()
+
+    def _asyncpg_config(self):
+        """
+        Return the connection parameters in the form expected by asyncpg.
+
+        Returns:
+            dict: The connection parameters with the port converted to an integer.
+        """
+        connect_config = self.connection_config()
+        connect_config["port"] = int(connect_config["port"])
+        return connect_config
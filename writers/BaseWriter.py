@@ -1,12 +1,59 @@
-from abc import ABC, abstractmethod
+from abc import ABC
+
+from utils.Checkpoint import Checkpoint
+from utils.ConfigLoader import ConfigError
+from utils.Metrics import Metrics
+from utils.Pipeline import Pipeline
+from utils.TableSpec import TableSpec
+
+
+class DatabaseConnectionError(ConnectionError):
+    """
+    Exception raised when a writer can't connect to its database server.
+    """
+
+
+class StreamClosedError(Exception):
+    """
+    Exception raised when the reader of a streamed output closes it before all rows have been written.
+
+    Attributes:
+        target_name (str): The name of the stream, 'stdout' or the path of the named pipe.
+        rows (int): The number of rows written to the stream before it was closed.
+        total (int): The number of rows the job would have written.
+    """
+
+    def __init__(self, target_name, rows, total):
+        super().__init__(f"The reader closed {target_name} after {rows} of {total} rows had been written to it, "
+                         f"stopping.")
+        self.target_name = target_name
+        self.rows = rows
+        self.total = total
 
 
 class BaseWriter(ABC):
     """
     Abstract Base Class representing a writer.
+
+    The writer owns a pipeline: a generator stage produces batches of rows in the background and passes them
+    through a bounded queue to the sink stage, which child classes implement with open_sink, write_batch and
+    close_sink. Generation and output therefore overlap, and batching and backpressure are the same for all writers.
+    Child classes loading batches concurrently override write instead, see AsyncBaseWriter.
     """
 
-    def __init__(self, number_of_contacts, db_config, contact_generator):
+    # Default number of rows generated and written in one chunk
+    batch_size = 10000
+
+    # Default maximum number of generated batches waiting for the sink
+    queue_depth = 4
+
+    # Default backend of the generator stage, 'thread' or 'process'
+    pipeline_backend = "thread"
+
+    # Keys of the 'database' section passed to the database driver, the other keys are writer options
+    CONNECTION_KEYS = ("host", "port", "user", "password", "database")
+
+    def __init__(self, number_of_contacts, db_config, contact_generator, options=None):
         """
         Initialize BaseWriter with the number of contacts and a ContactDataGenerator instance.
 
@@ -14,17 +61,222 @@ class BaseWriter(ABC):
             number_of_contacts (int): The number of contacts for which data should be generated.
             db_config (dict): Dictionary with database connection details
             contact_generator (ContactDataGenerator): An instance of ContactDataGenerator to generate fake data.
+            options (dict): The generation options loaded by ConfigLoader. The writer uses 'name', 'batch_size',
+                            'queue_depth', 'pipeline_backend', 'table', 'metrics', 'checkpoint' and
+                            'connection_cache'; missing keys fall back to the defaults.
         """
+        options = options or {}
+
         self.number_of_contacts = number_of_contacts
         self.db_config = db_config
         self.contact_generator = contact_generator
+        self.name = options.get("name", "contact_data")
+        self.batch_size = options.get("batch_size", self.batch_size)
+        self.queue_depth = options.get("queue_depth", self.queue_depth)
+        self.pipeline_backend = options.get("pipeline_backend", self.pipeline_backend)
+        self.table_spec = TableSpec.from_options(contact_generator.FIELDS, options.get("table"))
+        self.metrics = Metrics(number_of_contacts, options.get("metrics"))
+
+        # Checkpointing of database loads, set up by JobRunner.prepare_checkpoint
+        checkpoint_options = options.get("checkpoint")
+        self.checkpoint = Checkpoint(checkpoint_options["file"]) if checkpoint_options else None
+        self.checkpoint_settings = checkpoint_options["settings"] if checkpoint_options else None
+        self.resume_state = checkpoint_options["state"] if checkpoint_options else None
+        self.start_row = 0
+        self.rows_done = 0
+
+        # Connections kept open between the jobs of a JobRunner, None to close them after every run
+        self.connection_cache = options.get("connection_cache")
+
+    def connection_config(self):
+        """
+        Return the database connection parameters without the writer options.
+
+        Returns:
+            dict: A new dictionary with the connection keys present in db_config.
+        """
+        return {key: value for key, value in self.db_config.items() if key in self.CONNECTION_KEYS}
+
+    def connection_key(self):
+        """
+        Return the key of the writer's connection in the connection cache.
+
+        Returns:
+            tuple: The writer type and all database settings, so only identically configured writers share it.
+        """
+        return (type(self).__name__,) + tuple(sorted(self.db_config.items()))
+
+    def open_connection(self, connect, is_open):
+        """
+        Return a connection from the connection cache, or a new one if the writer has no cache.
+
+        Args:
+            connect (callable): A function without arguments returning a new connection.
+            is_open (callable): A function returning whether a cached connection is still usable.
+
+        Returns:
+            The database connection.
+        """
+        if self.connection_cache is None:
+            return connect()
+        return self.connection_cache.get_connection(self.connection_key(), connect, is_open)
+
+    def release_connection(self, connection):
+        """
+        Close the connection after a successful run, unless it is kept in the connection cache.
+
+        Returns:
+            None
+        """
+        if self.connection_cache is None:
+            connection.close()
+
+    def discard_connection(self, connection):
+        """
+        Close the connection after a failed run, also removing it from the connection cache.
+
+        Returns:
+            None
+        """
+        if self.connection_cache is None:
+            connection.close()
+        else:
+            self.connection_cache.discard_connection(self.connection_key())
+
+    def generate_batches(self):
+        """
+        Generate the contact data for all contacts as a sequence of column batches.
+
+        The batches are generated ahead by the generator stage of the pipeline while the caller consumes them.
+        When an interrupted load is resumed, generation starts at start_row.
+
+        Returns:
+            Pipeline: An iterable of batches of at most batch_size rows, number_of_contacts rows in total.
+        """
+        return Pipeline(self.contact_generator, self.number_of_contacts, self.batch_size, self.queue_depth,
+                        self.pipeline_backend, self.start_row, self.metrics.generation_profile_file)
 
-    @abstractmethod
     def write(self):
         """
-        Write generated contact data to a specific output.
+        Generate contact data and write it to a specific output.
+
+        Opens the sink, passes every generated batch to write_batch and closes the sink. If anything fails, the
+        sink is aborted instead of closed and the error is re-raised. Every batch is recorded in the metrics with
+        the time spent in the sink stage. With checkpointing, the progress is saved after every batch and the state
+        file is removed once the load has completed.
+
+        Returns:
+            None
+
+        Raises:
+            NotImplementedError: If the child class implements neither write nor write_batch.
+        """
+        if type(self).write_batch is BaseWriter.write_batch:
+            raise NotImplementedError(f"{type(self).__name__} must implement write_batch or override write.")
+
+        self.metrics.start()
+        self.open_sink()
+        self.rows_done = self.start_row
+        self.metrics.total_rows = self.number_of_contacts - self.start_row
+        self.save_checkpoint()
+        try:
+            for batch in self.generate_batches():
+                with self.metrics.timer("sink"):
+                    self.write_batch(batch)
+                self.metrics.record_batch(batch)
+                self.rows_done += len(batch)
+                self.save_checkpoint()
+        except BaseException:
+            self.abort_sink()
+            if self.checkpoint is not None:
+                print(f"Load interrupted after {self.rows_done} of {self.number_of_contacts} rows. "
+                      f"Run again with --resume to continue.")
+            raise
+        with self.metrics.timer("sink"):
+            self.close_sink()
+        if self.checkpoint is not None:
+            self.checkpoint.clear()
+        self.metrics.finish()
+
+    def save_checkpoint(self):
+        """
+        Record the number of rows committed to the table in the state file, if checkpointing is enabled.
+
+        Writers with checkpointing commit every batch in write_batch, so rows_done is always committed.
+
+        Returns:
+            None
+        """
+        if self.checkpoint is not None:
+            self.checkpoint.save(self.table_name, self.rows_done, self.checkpoint_settings)
+
+    def resume_table(self, cursor):
+        """
+        Continue the interrupted load into its table, starting after the rows already committed to it.
+
+        The committed rows are counted in the table rather than taken from the state file, so a batch committed
+        right before the interruption is not loaded twice.
+
+        Args:
+            cursor: A cursor of the database connection.
+
+        Returns:
+            str: The name of the table of the interrupted load.
+
+        Raises:
+            ConfigError: If the table doesn't exist or holds more rows than requested.
+        """
+        table_name = self.resume_state["table_name"]
+        try:
+            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
+            self.start_row = cursor.fetchone()[0]
+        except Exception as e:
+            raise ConfigError(f"Unable to resume the load into table {table_name}. Please verify that it still "
+                              f"exists.\nError details: {e}") from e
+
+        if self.start_row > self.number_of_contacts:
+            raise ConfigError(f"Table {table_name} already holds {self.start_row} rows, more than number_of_contacts.")
+
+        print(f"Resuming load into table {table_name} at row {self.start_row} of {self.number_of_contacts}")
+        return table_name
+
+    def open_sink(self):
+        """
+        Prepare the output before the first batch is written, e.g. open a file or create a table.
+
+        Returns:
+            None
+        """
+        pass
+
+    def write_batch(self, batch):
+        """
+        Write one batch of generated contact data to the output.
+
+        Every child class using the pipeline of write implements this method; child classes that override write
+        with their own loop, like AsyncBaseWriter, don't need it. Child classes time the conversion of the batch
+        into the output format with self.metrics.timer("serialize").
+
+        Args:
+            batch (ContactBatch): The batch to write.
+
+        Returns:
+            None
+        """
+        pass
+
+    def close_sink(self):
+        """
+        Finish the output after the last batch is written, e.g. commit and print a success message.
 
-        This method needs to be implemented in every child class.
+        Returns:
+            None
+        """
+        pass
+
+    def abort_sink(self):
+        """
+        Release the resources of the output after a failure.
 
         Returns:
             None
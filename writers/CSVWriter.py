@@ -1,50 +1,204 @@
 import csv
+import gzip
+import io
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import islice
 from .BaseWriter import BaseWriter
+from utils.ConfigLoader import ConfigError
+
+# zstandard is optional, it is only required for compression = zstd
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 
 class CSVWriter(BaseWriter):
     """
-    Class for generating contact data and writing it to a CSV file.
+    Class for generating contact data and writing it to CSV files.
+
+    Every batch is formatted into one string at once and handed to a background thread that encodes, optionally
+    compresses (gzip or zstd) and writes it through a large buffer, so formatting the next batch overlaps the I/O.
+    With part_size set, the output is rotated into part files of part_size rows, each with its own header, which
+    can be loaded independently and concurrently downstream. Every part file has its own writer thread, so a part
+    still being compressed and written doesn't hold up the next ones.
     """
 
+    # File name extensions of the supported compressions
+    EXTENSIONS = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+    # Maximum number of formatted batches waiting for the background writer threads
+    MAX_PENDING_WRITES = 4
+
+    # Maximum number of part files written in parallel, each by its own thread
+    MAX_PARALLEL_PARTS = 4
+
     # Initialize without unnecessary db_config parameter
-    def __init__(self, number_of_contacts, contact_generator):
-        super().__init__(number_of_contacts, None, contact_generator)
+    def __init__(self, number_of_contacts, contact_generator, options=None):
+        super().__init__(number_of_contacts, None, contact_generator, options)
+
+        csv_options = (options or {}).get("csv") or {}
+        self.output_dir = csv_options.get("output_dir", "csv_output")
+        self.part_size = csv_options.get("part_size")
+        self.compression = csv_options.get("compression", "none")
+        self.compression_level = csv_options.get("compression_level")
+        self.buffer_size = csv_options.get("buffer_size", 1024 * 1024)
+
+    def open_sink(self):
+        """
+        Prepare the output directory and the background writer thread.
+
+        Returns:
+            None
+        """
+        if self.compression == "zstd" and zstandard is None:
+            raise ConfigError("compression = zstd requires the 'zstandard' package. Install it with: "
+                              "pip install zstandard")
+
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        # Generate a timestamp for the CSV file names
+        self.timestamp = datetime.now().strftime("%Y-%m-%dT%H-%M-%S")
+        self.file_names = []
 
-    def write(self):
+        # The header of every file
+        self.header = self._format([self.contact_generator.FIELDS])
+
+        self.part = None
+        self.part_rows = 0
+        self.parts = []
+        self.part_executors = deque()
+        self.pending_writes = deque()
+
+    def write_batch(self, batch):
         """
-        Generate contact data and write it to a CSV file.
+        Format one batch and queue it for writing, starting new part files as needed.
 
-        This method generates contact data for a specified number of contacts using the Faker library
-        and the given probabilities. The generated data is then written to a CSV file with a timestamp
-        in its name.
+        Args:
+            batch (ContactBatch): The batch to write.
 
         Returns:
             None
         """
+        rows = batch.rows()
+        remaining = len(batch)
 
-        # Generate a timestamp for the CSV file name
-        timestamp = datetime.now().strftime("%Y-%m-%dT%H-%M-%S")
+        while remaining:
+            if self.part is None or (self.part_size and self.part_rows >= self.part_size):
+                self._start_part()
 
-        # Open a new CSV file for writing
-        with open(f'csv_output/contact_data_{timestamp}.csv', 'w', newline='') as csvfile:
-            # Create a CSV writer object
-            csv_writer = csv.writer(csvfile, delimiter=';')
+            count = min(remaining, self.part_size - self.part_rows) if self.part_size else remaining
+            with self.metrics.timer("serialize"):
+                data = self._format(islice(rows, count))
+            self._submit(self.part[0].write, data)
+            self.part_rows += count
+            remaining -= count
 
-            # Define the header for the CSV file
-            header = ['first_name', 'last_name', 'date_of_birth', 'email', 'phone', 'street_address_1',
-                      'treet_address_2', 'city', 'state_province', 'postal_code', 'country']
+    def close_sink(self):
+        """
+        Close the last file, wait for all writes to finish and print the names of the created files.
 
-            # Write the header to the CSV file
-            csv_writer.writerow(header)
+        Returns:
+            None
+        """
+        self._submit(self._close_part, self.part)
+        for executor in self.part_executors:
+            executor.shutdown(wait=True)
+        for future in self.pending_writes:
+            future.result()
 
-            # Generate and write data for the specified number of contacts
-            for i in range(self.number_of_contacts):
-                # Generate contact data and format it as a list, then write it to the CSV file
-                row = [*self.contact_generator.generate_contact_data().values()]
-                csv_writer.writerow(row)
+        # Print a success message with the name of the created CSV files
+        if len(self.file_names) == 1:
+            print(f"CSV created successfully: {self.file_names[0]}")
+        else:
+            print(f"CSV created successfully: {len(self.file_names)} part files in {self.output_dir}: "
+                  f"{self.file_names[0]} ... {self.file_names[-1]}")
 
-        # Print a success message with the name of the created CSV file
-        print(f"CSV created successfully: contact_data_{timestamp}.csv")
+    def abort_sink(self):
+        for executor in self.part_executors:
+            executor.shutdown(wait=True, cancel_futures=True)
+        for part in self.parts:
+            self._close_part(part)
 
+    def _start_part(self):
+        """
+        Close the current file in the background and open the next one on a new writer thread, starting with the
+        header.
+        """
+        if self.part is not None:
+            self._submit(self._close_part, self.part)
+
+        # Writes to one file stay in order on its own thread, the oldest thread is finished if too many are busy
+        self.part_executors.append(ThreadPoolExecutor(1))
+        while len(self.part_executors) > self.MAX_PARALLEL_PARTS:
+            self.part_executors.popleft().shutdown(wait=True)
+
+        # Without part_size a single file is written, otherwise numbered part files
+        if self.part_size:
+            file_name = f"{self.name}_{self.timestamp}_part{len(self.file_names) + 1:05d}.csv"
+        else:
+            file_name = f"{self.name}_{self.timestamp}.csv"
+        file_name += self.EXTENSIONS[self.compression]
+
+        self.part = self._open_part(os.path.join(self.output_dir, file_name))
+        self.parts.append(self.part)
+        self.part_rows = 0
+        self.file_names.append(file_name)
+        self._submit(self.part[0].write, self.header)
+
+    def _open_part(self, path):
+        """
+        Open a file for writing, wrapped in a compressor if compression is enabled.
+
+        Args:
+            path (str): The path of the file.
+
+        Returns:
+            tuple: The stream to write encoded data to and the underlying file.
+        """
+        raw_file = open(path, "wb", buffering=self.buffer_size)
+        if self.compression == "gzip":
+            stream = gzip.GzipFile(fileobj=raw_file, mode="wb", compresslevel=self.compression_level or 6)
+        elif self.compression == "zstd":
+            compressor = zstandard.ZstdCompressor(level=self.compression_level or 3)
+            stream = compressor.stream_writer(raw_file, closefd=False)
+        else:
+            stream = raw_file
+        return stream, raw_file
+
+    @staticmethod
+    def _close_part(part):
+        """
+        Flush and close a file opened by _open_part.
+        """
+        stream, raw_file = part
+        if not stream.closed:
+            stream.close()
+        if not raw_file.closed:
+            raw_file.close()
+
+    def _submit(self, function, argument):
+        """
+        Run a write on the thread of the current file, waiting for the oldest write if too many are queued.
+        """
+        self.pending_writes.append(self.part_executors[-1].submit(function, argument))
+        while len(self.pending_writes) > self.MAX_PENDING_WRITES:
+            self.pending_writes.popleft().result()
+
+    @staticmethod
+    def _format(rows):
+        """
+        Format rows as semicolon separated CSV in one call.
+
+        Args:
+            rows (iterable): The rows to format.
+
+        Returns:
+            bytes: The UTF-8 encoded CSV text.
+        """
+        buffer = io.StringIO()
+        csv.writer(buffer, delimiter=';').writerows(rows)
+        return buffer.getvalue().encode("utf-8")
@@ -0,0 +1,132 @@
+import os
+from abc import abstractmethod
+from datetime import datetime
+import pyarrow as pa
+import pyarrow.compute as pc
+from .BaseWriter import BaseWriter
+
+
+class ColumnarWriter(BaseWriter):
+    """
+    Abstract Base Class representing a writer of typed columnar files built with pyarrow.
+
+    Every batch is converted column by column into an Arrow record batch, with date_of_birth as a real date type,
+    key columns as 64 bit integers and missing values as nulls, and is streamed to the file as soon as it arrives,
+    so memory use is bounded by the batch size.
+    """
+
+    # Fields stored as dates, all other fields are stored as strings
+    DATE_FIELDS = ("date_of_birth",)
+
+    # File name extension, defined by every child class
+    extension = None
+
+    # Name of the format in messages, defined by every child class
+    format_name = None
+
+    # Initialize without unnecessary db_config parameter
+    def __init__(self, number_of_contacts, contact_generator, options=None):
+        super().__init__(number_of_contacts, None, contact_generator, options)
+
+        columnar_options = (options or {}).get("columnar") or {}
+        self.output_dir = columnar_options.get("output_dir", "columnar_output")
+        self.compression = columnar_options.get("compression", "none")
+
+        self.schema = pa.schema([pa.field(field, self._arrow_type(field)) for field in contact_generator.FIELDS])
+
+    def open_sink(self):
+        """
+        Create the output file.
+
+        Returns:
+            None
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        # Generate a timestamp for the file name
+        timestamp = datetime.now().strftime("%Y-%m-%dT%H-%M-%S")
+        self.file_name = f"{self.name}_{timestamp}{self.extension}"
+        self.file_writer = self.open_file(os.path.join(self.output_dir, self.file_name))
+
+    def write_batch(self, batch):
+        """
+        Convert one batch into an Arrow record batch and append it to the file.
+
+        Args:
+            batch (ContactBatch): The batch to write.
+
+        Returns:
+            None
+        """
+        with self.metrics.timer("serialize"):
+            record_batch = self.to_record_batch(batch)
+        self.write_record_batch(record_batch)
+
+    def close_sink(self):
+        """
+        Close the file and print its name.
+
+        Returns:
+            None
+        """
+        self.file_writer.close()
+
+        # Print a success message with the name of the created file
+        print(f"{self.format_name} created successfully: {self.file_name}")
+
+    def abort_sink(self):
+        self.file_writer.close()
+
+    def to_record_batch(self, batch):
+        """
+        Convert the column arrays of a batch into a typed Arrow record batch.
+
+        Args:
+            batch (ContactBatch): The batch to convert.
+
+        Returns:
+            pyarrow.RecordBatch: The record batch with the writer's schema.
+        """
+        arrays = []
+        for field in self.schema:
+            if field.type == pa.int64():
+                arrays.append(pa.array(batch.columns[field.name], type=pa.int64()))
+                continue
+            array = pa.array(batch.columns[field.name], type=pa.string())
+            if field.type == pa.date32():
+                array = pc.strptime(array, format="%Y-%m-%d", unit="s").cast(pa.date32())
+            arrays.append(array)
+        return pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+    def _arrow_type(self, field):
+        """
+        Return the Arrow type of a column: date32 for dates, int64 for key columns and string otherwise.
+        """
+        if field in self.DATE_FIELDS:
+            return pa.date32()
+        if self.table_spec.column_type(field) == "BIGINT":
+            return pa.int64()
+        return pa.string()
+
+    @abstractmethod
+    def open_file(self, path):
+        """
+        Open the format-specific file writer.
+
+        Args:
+            path (str): The path of the file.
+
+        Returns:
+            The file writer, which must have a close method.
+        """
+        pass
+
+    @abstractmethod
+    def write_record_batch(self, record_batch):
+        """
+        Append one record batch to the file.
+
+        Args:
+            record_batch (pyarrow.RecordBatch): The record batch to write.
+        """
+        pass
@@ -1,21 +1,28 @@
 import mysql.connector
 from datetime import datetime
-import sys
-from .BaseWriter import BaseWriter
+import os
+import tempfile
+import time
+from .BaseWriter import BaseWriter, DatabaseConnectionError
+from utils.RowFormatter import RowFormatter
 
 
 class MySQLWriter(BaseWriter):
     """
     Class for writing contact data to a MySQL database.
+
+    open_sink connects to the MySQL server using the provided db_config dictionary, creates a new database if
+    it doesn't exist, then creates a new table with a unique timestamp in the name, or reopens the table of an
+    interrupted load when resuming. Every batch is loaded and committed by write_batch, so a failure only loses the
+    current batch, and close_sink creates the keys and indexes of the table spec and prints the achieved rows/sec.
+
+    With the default 'insert' load_method each batch is sent as an extended multi-row INSERT, with 'load_data' it is
+    written to a temporary file and loaded with LOAD DATA LOCAL INFILE.
     """
 
-    def write(self):
+    def open_sink(self):
         """
-        Write generated contact data to a MySQL database.
-
-        This function connects to the MySQL server using the provided db_config dictionary, creates a new database if
-        it doesn't exist, then creates a new table with a unique timestamp in the name, and inserts the generated
-        contact data into that table.
+        Create the target database if needed and a new table, or continue the table of an interrupted load.
 
         Returns:
             None
@@ -23,62 +30,115 @@ class MySQLWriter(BaseWriter):
         Raises:
             mysql.connector.Error: If there is a problem with the database connection or queries.
         """
-        try:
-            connect_config = self.db_config.copy()
-            database_name = connect_config.pop('database')
+        database_name = self.db_config["database"]
+        self.load_method = self.db_config.get("load_method", "insert")
 
-            # Connect to MySQL without specifying the database
-            connection = mysql.connector.connect(**connect_config)
-            cursor = connection.cursor()
-        except mysql.connector.DatabaseError as e:
-            print("Error: Unable to establish a connection to the MySQL server. Please verify your connection parameters.")
-            print("Error details:", e)
-            sys.exit(1)
+        # Reuse the connection of a previous job with the same settings
+        self.connection = self.open_connection(self._connect, lambda connection: connection.is_connected())
+        self.cursor = self.connection.cursor()
 
         # Create database if it doesn't exist
         create_database_query = f"CREATE DATABASE IF NOT EXISTS {database_name}"
-        cursor.execute(create_database_query)
+        self.cursor.execute(create_database_query)
 
         # Use the specified database
-        cursor.execute(f"USE {database_name}")
-
-        # Create table with dynamic name
-        timestamp = datetime.now().strftime("%Y_%m_%dT%H_%M_%S")
-        table_name = f"contact_data_{timestamp}"
-        create_table_query = f"""
-            CREATE TABLE {table_name} (
-                first_name VARCHAR(255),
-                last_name VARCHAR(255),
-                date_of_birth DATE,
-                email VARCHAR(255),
-                phone VARCHAR(255),
-                street_address_1 VARCHAR(255),
-                street_address_2 VARCHAR(255),
-                city VARCHAR(255),
-                state_province VARCHAR(255),
-                postal_code VARCHAR(255),
-                country VARCHAR(255)
-            );
+        self.cursor.execute(f"USE {database_name}")
+
+        if self.resume_state:
+            # Continue the interrupted load in its table
+            self.table_name = self.resume_table(self.cursor)
+        else:
+            # Create table with dynamic name
+            timestamp = datetime.now().strftime("%Y_%m_%dT%H_%M_%S")
+            self.table_name = f"{self.name}_{timestamp}"
+            create_table_query = self.table_spec.create_table_query(self.table_name, "mysql")
+
+            self.cursor.execute(create_table_query)
+        for query in self.table_spec.pre_load_queries(self.table_name, "mysql"):
+            self.cursor.execute(query)
+
+        # Prepare the statements of both load methods
+        columns = ', '.join(self.contact_generator.FIELDS)
+        self.insert_query = (f"INSERT INTO {self.table_name} ({columns}) "
+                             f"VALUES ({', '.join(['%s'] * len(self.contact_generator.FIELDS))})")
+        self.load_query = (f"LOAD DATA LOCAL INFILE %s INTO TABLE {self.table_name} CHARACTER SET utf8mb4 "
+                           f"({columns})")
+
+        self.rows = 0
+        self.start_time = time.perf_counter()
+
+    def write_batch(self, batch):
+        """
+        Load one batch into the table and commit it.
+
+        With 'insert', Connector/Python rewrites executemany of a simple INSERT into one extended INSERT. With
+        'load_data', the batch is written to a temporary tab separated file (the default LOAD DATA format, NULL
+        written as \\N), which is removed once it has been loaded.
+
+        Args:
+            batch (ContactBatch): The batch to load.
+
+        Returns:
+            None
+        """
+        if self.load_method == "load_data":
+            with self.metrics.timer("serialize"):
+                data = RowFormatter.to_copy_text(batch)
+            with tempfile.NamedTemporaryFile("w", encoding="utf-8", suffix=".tsv", delete=False) as data_file:
+                data_file.write(data)
+            try:
+                self.cursor.execute(self.load_query, (data_file.name,))
+            finally:
+                os.remove(data_file.name)
+        else:
+            with self.metrics.timer("serialize"):
+                rows = list(batch.rows())
+            self.cursor.executemany(self.insert_query, rows)
+
+        self.connection.commit()
+        self.rows += len(batch)
+
+    def close_sink(self):
         """
+        Create keys and indexes, close the connection and print the achieved throughput.
 
-        cursor.execute(create_table_query)
+        Returns:
+            None
+        """
+        elapsed = time.perf_counter() - self.start_time
+
+        # Restore load-time settings and create keys and indexes now that the data is loaded
+        for query in self.table_spec.post_load_queries(self.table_name, "mysql"):
+            self.cursor.execute(query)
 
-        # Insert data into the table
-        for i in range(self.number_of_contacts):
-            contact_data = self.contact_generator.generate_contact_data()
-            insert_query = f"""
-                INSERT INTO {table_name} (first_name, last_name, date_of_birth, email, phone, street_address_1, 
-                street_address_2, city, state_province, postal_code, country)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """
+        # Close the cursor and the connection, unless it is kept for the next job
+        self.cursor.close()
+        self.release_connection(self.connection)
 
-            cursor.execute(insert_query, tuple(contact_data.values()))
+        # Print a success message with table name and throughput
+        print(f"Data inserted successfully into table: {self.table_name}")
+        print(f"Loaded {self.rows} rows in {elapsed:.2f} s ({self.rows / elapsed if elapsed else 0:.0f} rows/sec, "
+              f"load_method={self.load_method}, batch_size={self.batch_size})")
 
-        connection.commit()
+    def abort_sink(self):
+        self.discard_connection(self.connection)
 
-        # Close the cursor and the connection
-        cursor.close()
-        connection.close()
+    def _connect(self):
+        """
+        Connect to the MySQL server without selecting a database.
+
+        Returns:
+            connection: The connection to the server.
 
-        # Print a success message with table name
-        print(f"Data inserted successfully into table: {table_name}")
+        Raises:
+            DatabaseConnectionError: If the server can't be reached or refuses the connection.
+        """
+        try:
+            connect_config = self.connection_config()
+            connect_config.pop('database')
+
+            # Connect to MySQL without specifying the database
+            return mysql.connector.connect(**connect_config, allow_local_infile=self.load_method == "load_data")
+        except mysql.connector.DatabaseError as e:
+            raise DatabaseConnectionError(f"Unable to establish a connection to the MySQL server. Please verify your "
+                                          f"connection parameters.\nError details: {e}") from e
@@ -0,0 +1,18 @@
+import pyarrow as pa
+import pyarrow.parquet as pq
+from .ColumnarWriter import ColumnarWriter
+
+
+class ParquetWriter(ColumnarWriter):
+    """
+    Class for generating contact data and writing it to a Parquet file, one row group per batch.
+    """
+
+    extension = ".parquet"
+    format_name = "Parquet"
+
+    def open_file(self, path):
+        return pq.ParquetWriter(path, self.schema, compression=self.compression)
+
+    def write_record_batch(self, record_batch):
+        self.file_writer.write_table(pa.Table.from_batches([record_batch]), row_group_size=record_batch.num_rows)
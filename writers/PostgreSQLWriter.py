@@ -1,22 +1,28 @@
-import sys
+import io
 import psycopg2
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 from datetime import datetime
-from .BaseWriter import BaseWriter
+from .BaseWriter import BaseWriter, DatabaseConnectionError
+from utils.RowFormatter import RowFormatter
 
 
 class PostgreSQLWriter(BaseWriter):
     """
     Class for generating contact data and writing it to a PostgreSQL database.
+
+    open_sink creates a new database if it doesn't exist, then creates a new table with a unique timestamp in
+    the name, or reopens the table of an interrupted load when resuming. Every batch is loaded and committed by
+    write_batch, so a failure only loses the current batch, and close_sink creates the keys and indexes of the table
+    spec. It connects to the PostgreSQL server using the provided db_config dictionary.
+
+    With the default 'copy' load_method, every batch is serialized into an in-memory buffer and streamed to the
+    server with COPY ... FROM STDIN, so only one batch is held in memory at a time. The 'insert' load_method
+    sends the rows with INSERT statements instead.
     """
 
-    def write(self):
+    def open_sink(self):
         """
-        Write generated contact data to a PostgreSQL database.
-
-        This method creates a new database if it doesn't exist, then creates a new table with a unique timestamp in
-        the name, and inserts the generated contact data into that table. It connects to the PostgreSQL server using the
-        provided db_config dictionary.
+        Create the target database if needed and a new table, or continue the table of an interrupted load.
 
         Returns:
             None
@@ -24,19 +30,94 @@ class PostgreSQLWriter(BaseWriter):
         Raises:
             psycopg2.Error: If there is a problem with the database connection or queries.
         """
+        # Reuse the connection of a previous job with the same settings, which has created the database already
+        self.connection = self.open_connection(self._connect, lambda connection: not connection.closed)
+        self.cursor = self.connection.cursor()
+
+        if self.resume_state:
+            # Continue the interrupted load in its table
+            self.table_name = self.resume_table(self.cursor)
+        else:
+            # Create table with dynamic name
+            timestamp = datetime.now().strftime("%Y_%m_%dT%H_%M_%S")
+            self.table_name = f"{self.name}_{timestamp}"
+
+            create_table_query = self.table_spec.create_table_query(self.table_name, "postgresql")
+
+            self.cursor.execute(create_table_query)
+        self.connection.commit()
+
+        # Prepare the statement of the selected load method
+        columns = ', '.join(self.contact_generator.FIELDS)
+        self.use_copy = self.db_config.get("load_method", "copy") == "copy"
+        self.copy_query = f"COPY {self.table_name} ({columns}) FROM STDIN"
+        self.insert_query = (f"INSERT INTO {self.table_name} ({columns}) "
+                             f"VALUES ({', '.join(['%s'] * len(self.contact_generator.FIELDS))})")
+
+    def write_batch(self, batch):
+        """
+        Load one batch into the table with COPY ... FROM STDIN or INSERT statements and commit it.
+
+        Args:
+            batch (ContactBatch): The batch to load.
+
+        Returns:
+            None
+        """
+        if self.use_copy:
+            with self.metrics.timer("serialize"):
+                buffer = io.StringIO(RowFormatter.to_copy_text(batch))
+            self.cursor.copy_expert(self.copy_query, buffer)
+        else:
+            with self.metrics.timer("serialize"):
+                rows = list(batch.rows())
+            self.cursor.executemany(self.insert_query, rows)
+
+        self.connection.commit()
+
+    def close_sink(self):
+        """
+        Create keys and indexes and close the connection.
+
+        Returns:
+            None
+        """
+        # Restore load-time table settings and create keys and indexes now that the data is loaded
+        for query in self.table_spec.post_load_queries(self.table_name, "postgresql"):
+            self.cursor.execute(query)
+        self.connection.commit()
+
+        # Close the cursor and the connection, unless it is kept for the next job
+        self.cursor.close()
+        self.release_connection(self.connection)
+
+        # Print a success message with table name
+        print(f"Data inserted successfully into table: {self.table_name}")
+
+    def abort_sink(self):
+        self.discard_connection(self.connection)
+
+    def _connect(self):
+        """
+        Create the target database if it doesn't exist and connect to it.
+
+        Returns:
+            connection: The connection to the target database.
+
+        Raises:
+            DatabaseConnectionError: If the server can't be reached or refuses the connection.
+        """
         # Connect to the default 'postgres' database
         try:
-            default_db_config = self.db_config.copy()
+            default_db_config = self.connection_config()
             default_db_config["database"] = "postgres"
 
             connection = psycopg2.connect(**default_db_config)
             connection.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
             cursor = connection.cursor()
         except psycopg2.DatabaseError as e:
-            print(
-                "Error: Unable to establish a connection to the PostgreSQL server. Please verify connection parameters.")
-            print("Error details:", e)
-            sys.exit(1)
+            raise DatabaseConnectionError(f"Unable to establish a connection to the PostgreSQL server. Please verify "
+                                          f"connection parameters.\nError details: {e}") from e
 
         # Check if the target database exists and create it if it doesn't
         target_database = self.db_config["database"]
@@ -51,49 +132,4 @@ class PostgreSQLWriter(BaseWriter):
         connection.close()
 
         # Connect to the target database
-        connection = psycopg2.connect(**self.db_config)
-        cursor = connection.cursor()
-
-        # Create table with dynamic name
-        timestamp = datetime.now().strftime("%Y_%m_%dT%H_%M_%S")
-        table_name = f"contact_data_{timestamp}"
-
-        create_table_query = f"""
-            CREATE TABLE {table_name} (
-                first_name VARCHAR(255),
-                last_name VARCHAR(255),
-                date_of_birth DATE,
-                email VARCHAR(255),
-                phone VARCHAR(255),
-                street_address_1 VARCHAR(255),
-                street_address_2 VARCHAR(255),
-                city VARCHAR(255),
-                state_province VARCHAR(255),
-                postal_code VARCHAR(255),
-                country VARCHAR(255)
-            );
-
-        """
-
-        cursor.execute(create_table_query)
-        connection.commit()
-
-        # Insert data into the table
-        for i in range(self.number_of_contacts):
-            contact_data = self.contact_generator.generate_contact_data()
-            insert_query = f"""
-                INSERT INTO {table_name} (first_name, last_name, date_of_birth, email, phone, street_address_1, 
-                street_address_2, city, state_province, postal_code, country)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """
-
-            cursor.execute(insert_query, tuple(contact_data.values()))
-
-        connection.commit()
-
-        # Close the cursor and the connection
-        cursor.close()
-        connection.close()
-
-        # Print a success message with table name
-        print(f"Data inserted successfully into table: {table_name}")
+        return psycopg2.connect(**self.connection_config())
@@ -0,0 +1,110 @@
+import sys
+from .BaseWriter import BaseWriter, StreamClosedError
+from utils.RowFormatter import RowFormatter
+
+
+class StreamWriter(BaseWriter):
+    """
+    Class for streaming contact data to stdout or a named pipe, e.g. into psql \\copy, mysqlimport or split.
+
+    Every batch is serialized in one call and written through a large buffer. Writes block while the reader is
+    busy, and the bounded queue of the pipeline then pauses generation, so the generator never runs ahead of the
+    reader. If the reader closes the stream early (e.g. head), the writer stops with StreamClosedError instead of
+    failing with a broken pipe. Messages go to stderr so that stdout carries only data.
+    """
+
+    # Supported formats: CSV, tab separated values, newline delimited JSON and PostgreSQL COPY text format
+    FORMATS = ("csv", "tsv", "ndjson", "copy")
+
+    # Initialize without unnecessary db_config parameter
+    def __init__(self, number_of_contacts, contact_generator, options=None):
+        super().__init__(number_of_contacts, None, contact_generator, options)
+
+        stream_options = (options or {}).get("stream") or {}
+        self.target = stream_options.get("target", "-")
+        self.format = stream_options.get("format", "csv")
+        self.delimiter = "\t" if self.format == "tsv" else stream_options.get("delimiter", ";")
+        self.header = stream_options.get("header", True) and self.format in ("csv", "tsv")
+        self.buffer_size = stream_options.get("buffer_size", 1024 * 1024)
+
+    def open_sink(self):
+        """
+        Open stdout or the named pipe and write the header.
+
+        Opening a named pipe waits until a reader has opened it.
+
+        Returns:
+            None
+        """
+        if self.target == "-":
+            self.target_name = "stdout"
+            self.stream = open(sys.stdout.fileno(), "wb", buffering=self.buffer_size, closefd=False)
+        else:
+            self.target_name = self.target
+            self.stream = open(self.target, "wb", buffering=self.buffer_size)
+
+        self.rows = 0
+        if self.header:
+            self._write(f"{self.delimiter.join(self.contact_generator.FIELDS)}\n".encode("utf-8"))
+
+    def write_batch(self, batch):
+        """
+        Serialize one batch in the selected format and write it to the stream.
+
+        Args:
+            batch (ContactBatch): The batch to write.
+
+        Returns:
+            None
+        """
+        with self.metrics.timer("serialize"):
+            if self.format == "ndjson":
+                text = RowFormatter.to_ndjson(batch)
+            elif self.format == "copy":
+                text = RowFormatter.to_copy_text(batch)
+            else:
+                text = RowFormatter.to_csv(batch, self.delimiter)
+            data = text.encode("utf-8")
+
+        # Count the rows before writing, a write failing because the reader has gone away may have passed them on
+        self.rows += len(batch)
+        self._write(data)
+
+    def close_sink(self):
+        """
+        Flush and close the stream and print the number of streamed rows.
+
+        Returns:
+            None
+        """
+        try:
+            self.stream.close()
+        except BrokenPipeError:
+            self._reader_closed()
+
+        # Print a success message to stderr, stdout may carry the data
+        print(f"Streamed {self.rows} rows as {self.format} to {self.target_name}", file=sys.stderr)
+
+    def abort_sink(self):
+        try:
+            self.stream.close()
+        except OSError:
+            pass
+
+    def _write(self, data):
+        """
+        Write encoded data to the stream, stopping if the reader has gone away.
+        """
+        try:
+            self.stream.write(data)
+        except BrokenPipeError:
+            self._reader_closed()
+
+    def _reader_closed(self):
+        """
+        Stop the job after the reader closed the stream, which is a normal end of a pipeline such as '| head'.
+
+        Raises:
+            StreamClosedError: Always, with the number of rows written.
+        """
+        raise StreamClosedError(self.target_name, self.rows, self.number_of_contacts)